@@ -0,0 +1,73 @@
+"""Times the frame where half of the organisms and half of the food go at once, for bigger and bigger worlds.
+
+Run from the repo root with `python benchmarks/die_off.py`. The old way of calling list.remove on each
+dead organism and eaten food is timed next to ObjectWorld.step so the difference is easy to see.
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from simulator.Food import Food
+from simulator.main import ObjectWorld
+from simulator.scenario import load_scenario
+
+
+def make_world(population):
+    world = ObjectWorld(load_scenario("simple"), seed=0)
+    organism = world.organisms[0]
+    # children of one organism are quicker to make than new organisms and are just as good here
+    world.organisms = [organism.reproduce() for _ in range(population)]
+    for food in world.foods:
+        world.food_grid.remove(food)
+    world.foods = []
+    for _ in range(population):
+        food = Food((10, 10))
+        world.foods.append(food)
+        world.food_grid.add(food)
+    for i, organism in enumerate(world.organisms):
+        # every other organism is past its max age and every other food has been eaten
+        if i % 2:
+            organism.age = organism.max_age + 1
+            world.foods[i].eaten = True
+        else:
+            # speed 0 and already targeting a food that is still there, so the frame is all removals
+            organism.target_food = world.foods[i]
+            organism.speed = 0
+    world.recount()
+    return world
+
+
+def old_removal(world):
+    for food in world.foods:
+        if food.eaten:
+            world.foods.remove(food)
+            world.food_grid.remove(food)
+    for organism in reversed(world.organisms):
+        if organism.age > organism.max_age:
+            world.organisms.remove(organism)
+
+
+def main():
+    random.seed(0)
+    print("ms for the frame where half the organisms die and half the food is gone")
+    print(f"{'population':>10} {'step':>10} {'old removal':>12}")
+    for population in [1000, 5000, 20000]:
+        world = make_world(population)
+        start = time.perf_counter()
+        world.step()
+        step = (time.perf_counter() - start) * 1000
+
+        world = make_world(population)
+        start = time.perf_counter()
+        old_removal(world)
+        old = (time.perf_counter() - start) * 1000
+        print(f"{population:>10} {step:>10.1f} {old:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
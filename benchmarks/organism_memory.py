@@ -0,0 +1,45 @@
+"""Measures how much memory each Organism takes, for the starting organisms and for children made by reproduce.
+
+Run from the repo root with `python benchmarks/organism_memory.py`. Children are what almost every
+organism in a long run is, so that is the number that decides how big a population fits in memory.
+"""
+
+import os
+import sys
+import random
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from simulator.Organism import Organism
+from simulator.scenario import load_scenario
+
+POPULATION = 100000
+
+
+def measure(make):
+    """Bytes allocated per organism while making POPULATION of them"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    organisms = [make() for _ in range(POPULATION)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(organisms)
+
+
+def main():
+    random.seed(0)
+    # var5 uses energy and big litters so every field an organism can have is set
+    scenario = load_scenario("var5")
+    parent = Organism((450, 350), (128, 128, 128), 4.5, scenario)
+    per_start = measure(lambda: Organism((450, 350), (128, 128, 128), 4.5, scenario))
+    per_child = measure(parent.reproduce)
+    print(f"bytes per organism, averaged over {POPULATION}")
+    print(f"{'starting':>10} {per_start:>8.0f}")
+    print(f"{'children':>10} {per_child:>8.0f}")
+    print(f"{POPULATION} children take {per_child * POPULATION / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Times making a litter one child at a time with Organism.reproduce and all at once with Organism.reproduce_litter.
+
+Run from the repo root with `python benchmarks/reproduce.py`. main.BATCH_LITTER is the litter size from
+which ObjectWorld uses reproduce_litter, it should be about where the two columns cross.
+"""
+
+import os
+import sys
+import timeit
+import random
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from simulator.Organism import Organism
+from simulator.scenario import load_scenario
+
+LITTERS = 2000
+
+
+def main():
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    parent = Organism((450, 350), (128, 128, 128), 4.5, load_scenario("simple"))
+    print(f"microseconds per litter, averaged over {LITTERS} litters")
+    print(f"{'children':>8} {'reproduce':>10} {'reproduce_litter':>17}")
+    for n in [1, 2, 4, 8, 16, 64]:
+        one_at_a_time = timeit.timeit(
+            lambda: [parent.reproduce() for _ in range(n)], number=LITTERS
+        )
+        batched = timeit.timeit(lambda: parent.reproduce_litter(n, rng), number=LITTERS)
+        print(
+            f"{n:>8} {one_at_a_time / LITTERS * 1e6:>10.1f} {batched / LITTERS * 1e6:>17.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
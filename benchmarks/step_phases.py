@@ -0,0 +1,195 @@
+"""Times each phase of a frame (targeting, movement, reproduction, removal, stats and render) on its own, and
+the whole step, for worlds of every combination of population and food amount.
+
+Run from the repo root with `python benchmarks/step_phases.py`, e.g.
+`python benchmarks/step_phases.py --organisms 1000 10000 --foods 100 1000 --frames 5 --output before.json`.
+Every world is made from the same seed so two runs on different versions of the simulator time the same
+work, and the results are saved as json to compare them.
+
+The object engine does targeting, movement and reproduction for each organism in one loop, so here each
+of them is run over every organism on its own: targeting clears every target first so every organism looks
+for food in retarget, movement moves every organism towards its target and reproduction makes one child for every
+tenth organism. Removal is remove_eaten_food, which for the vector engine is remove_dead as well.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pygame as pg
+
+from simulator.main import ObjectWorld, new_data, gather
+from simulator.VectorWorld import VectorWorld
+from simulator.Renderer import Renderer
+from simulator.scenario import load_scenario
+
+SEED = 0
+
+
+def make_world(engine, organisms, foods):
+    """A world with organisms starting organisms and foods starting food, the same every time"""
+    scenario = {
+        **load_scenario("simple"),
+        "start_colors": [[128, 128, 128]] * organisms,
+        "food_amount": foods,
+    }
+    world_type = VectorWorld if engine == "vector" else ObjectWorld
+    return world_type(scenario, max_population=organisms, seed=SEED)
+
+
+def object_phases(world):
+    """The phases of ObjectWorld, each a function that runs it once"""
+
+    def targeting():
+        for organism in world.organisms:
+            if organism.target_food is not None:
+                organism.target_food.chasers.discard(organism)
+            organism.target_food = None
+        world.retarget()
+
+    def movement():
+        for organism in world.organisms:
+            organism.move(world.food_grid)
+
+    def reproduction():
+        for organism in world.organisms[::10]:
+            organism.reproduce()
+
+    return {
+        "targeting": targeting,
+        "movement": movement,
+        "reproduction": reproduction,
+        "removal": world.remove_eaten_food,
+    }
+
+
+def vector_phases(world):
+    """The phases of VectorWorld, each a function that runs it once"""
+
+    def targeting():
+        world.orgs["target"][:] = -1
+        world.target()
+
+    def removal():
+        world.remove_eaten_food()
+        world.remove_dead()
+
+    return {
+        "targeting": targeting,
+        "movement": world.move,
+        "reproduction": world.reproduce,
+        "removal": removal,
+    }
+
+
+def time_phases(engine, organisms, foods, frames):
+    """ms per frame of every phase, and of the whole step on a world of its own"""
+    world = make_world(engine, organisms, foods)
+    phases = object_phases(world) if engine == "object" else vector_phases(world)
+    data = new_data(world.scenario, world.streams.seed)
+    screen = pg.Surface((900, 700))
+    renderer = Renderer()
+    phases["stats"] = lambda: gather(data, 0, world)
+    phases["render"] = lambda: renderer.summon(screen, world)
+
+    totals = dict.fromkeys(phases, 0.0)
+    for _ in range(frames):
+        for phase, run in phases.items():
+            start = time.perf_counter()
+            run()
+            totals[phase] += time.perf_counter() - start
+
+    world = make_world(engine, organisms, foods)
+    start = time.perf_counter()
+    for _ in range(frames):
+        world.step()
+    totals["step"] = time.perf_counter() - start
+    return {phase: total / frames * 1000 for phase, total in totals.items()}
+
+
+def commit():
+    """The git commit being benchmarked, or None outside of a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--engine",
+        nargs="+",
+        choices=["object", "vector"],
+        default=["object", "vector"],
+    )
+    parser.add_argument(
+        "--organisms", nargs="+", type=int, default=[1000, 10000, 50000]
+    )
+    parser.add_argument("--foods", nargs="+", type=int, default=[100, 1000, 10000])
+    parser.add_argument(
+        "--frames", type=int, default=5, help="frames timed for each world"
+    )
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    pg.init()
+    results = []
+    print("ms per frame")
+    header = None
+    for engine in args.engine:
+        for organisms in args.organisms:
+            for foods in args.foods:
+                times = time_phases(engine, organisms, foods, args.frames)
+                if header is None:
+                    header = list(times)
+                    print(
+                        f"{'engine':>6} {'organisms':>9} {'foods':>6} "
+                        + " ".join(f"{phase:>12}" for phase in header)
+                    )
+                print(
+                    f"{engine:>6} {organisms:>9} {foods:>6} "
+                    + " ".join(f"{times[phase]:>12.2f}" for phase in header)
+                )
+                results.append(
+                    {
+                        "engine": engine,
+                        "organisms": organisms,
+                        "foods": foods,
+                        "ms": times,
+                    }
+                )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "commit": commit(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "frames": args.frames,
+                "seed": SEED,
+                "results": results,
+            },
+            f,
+            indent=1,
+        )
+    print(f"saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Times a frame of ObjectWorld when every organism already has a target that stays put, for more and more food.
+
+Run from the repo root with `python benchmarks/target_check.py`. Eating a food tells the organisms chasing it,
+so a target never has to be checked and the frame takes as long whatever the amount of food. The old
+`target_food not in foods` check every organism did each frame is timed next to it so the difference is easy
+to see.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from simulator.main import ObjectWorld
+from simulator.scenario import load_scenario
+
+ORGANISMS = 1000
+FRAMES = 20
+
+
+def make_world(food_amount):
+    scenario = {
+        **load_scenario("simple"),
+        "start_colors": [[128, 128, 128]] * ORGANISMS,
+        "food_amount": food_amount,
+    }
+    world = ObjectWorld(scenario, max_population=ORGANISMS, seed=0)
+    newest = world.foods[-1]
+    for i, organism in enumerate(world.organisms):
+        # below all the food with speed 0 so the organisms never reach their food and the targets stay the same,
+        # and a long life so none die while being timed
+        organism.pos.center = (100 + i % 800, 660)
+        organism.speed = 0
+        organism.max_age = FRAMES * 10
+        # target the newest food, the worst case for a list scan
+        organism.chase(newest)
+    world.recount()
+    return world
+
+
+def time_frames(step):
+    # one frame to warm up before timing
+    step()
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        step()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    print(f"{ORGANISMS} organisms, ms per frame averaged over {FRAMES} frames")
+    print(f"{'foods':>8} {'step':>14} {'list check':>14}")
+    for food_amount in [100, 1000, 10000]:
+        world = make_world(food_amount)
+
+        def list_frame():
+            for organism in world.organisms:
+                organism.target_food not in world.foods
+
+        print(
+            f"{food_amount:>8} {time_frames(world.step):>14.3f} {time_frames(list_frame):>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
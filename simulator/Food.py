@@ -0,0 +1,288 @@
+import itertools
+import pygame as pg
+import numpy as np
+import random
+
+# the distance matrix of FoodGrid.nearest_many is split into chunks of about this many entries
+NEAREST_CHUNK = 1_000_000
+# most eaten food a FoodPool keeps for reuse
+POOL_MAX = 5000
+# FoodGrid cells along each side of a region, the coarse level of the food density used by density perception
+REGION = 4
+
+
+class Food:
+    # gives every food a unique, increasing id so newer food can be told apart from older food
+    _ids = itertools.count()
+    __slots__ = ("id", "size", "pos", "eaten", "chasers")
+
+    def __init__(self, size, rng=random, center=None) -> None:
+        self.id = next(Food._ids)
+        self.size = size
+        self.pos = pg.Rect(0, 0, *size)
+        # rng is where the position is drawn from when no center is given, the placement stream of a
+        # RandomStreams in a simulation
+        self.pos.center = Food.place(rng) if center is None else center
+        self.eaten = False
+        # the organisms targeting this food, so only they have to look for new food when it's eaten
+        self.chasers = set()
+
+    @staticmethod
+    def place(rng):
+        """A random center for a new food"""
+        return rng.randint(50, 850), rng.randint(50, 600)
+
+    def reuse(self, size, center):
+        """Turn an eaten food into a new one, with a new id, instead of making another Food"""
+        self.id = next(Food._ids)
+        self.size = size
+        self.pos.size = size
+        self.pos.center = center
+        self.eaten = False
+        self.chasers.clear()
+
+    @classmethod
+    def restore(cls, id, size, topleft, eaten):
+        """A food exactly as it was saved in a checkpoint, without drawing any random numbers"""
+        food = cls.__new__(cls)
+        food.id = id
+        food.size = size
+        food.pos = pg.Rect(topleft, size)
+        food.eaten = eaten
+        food.chasers = set()
+        return food
+
+    @staticmethod
+    def reserve_ids(last_id):
+        """Make sure food made from now on gets an id bigger than last_id, for after restoring food"""
+        next_id = next(Food._ids)
+        Food._ids = itertools.count(max(next_id, last_id + 1))
+
+    def summon(self, screen):
+        pg.draw.rect(screen, (90, 200, 150), self.pos)
+
+
+class FoodPool:
+    """Eaten food kept to be used again for new food, so a spawn burst doesn't make a new Food and pg.Rect
+    for every food and eaten food isn't left for the garbage collector"""
+
+    def __init__(self) -> None:
+        self.free = []
+
+    def spawn(self, amount, size_range, spawn, placement):
+        """amount new food, sizes drawn from spawn and centers from placement. Every size is drawn and then
+        every center, which are the same numbers as making each Food in turn since they're separate streams
+        """
+        sizes = [
+            (spawn.randint(*size_range), spawn.randint(*size_range))
+            for _ in range(amount)
+        ]
+        centers = [Food.place(placement) for _ in range(amount)]
+        foods = []
+        for size, center in zip(sizes, centers):
+            if self.free:
+                food = self.free.pop()
+                food.reuse(size, center)
+            else:
+                food = Food(size, center=center)
+            foods.append(food)
+        return foods
+
+    def release(self, foods):
+        """Keep eaten food to be reused"""
+        self.free.extend(foods[: POOL_MAX - len(self.free)])
+
+
+class FoodGrid:
+    """Uniform grid of the foods on screen so the closest food can be found without checking every food"""
+
+    def __init__(self, foods=(), cell_size=50, screen_size=(900, 700)) -> None:
+        self.cell_size = cell_size
+        self.cols = screen_size[0] // cell_size + 1
+        self.rows = screen_size[1] // cell_size + 1
+        # each cell maps a food's id to the food
+        self.cells = [[{} for _ in range(self.rows)] for _ in range(self.cols)]
+        self.count = 0
+        # how much food is in each region of REGION by REGION cells, the count of a single cell is the length
+        # of its dict
+        self.region_cols = -(-self.cols // REGION)
+        self.region_rows = -(-self.rows // REGION)
+        self.region_counts = [[0] * self.region_rows for _ in range(self.region_cols)]
+        # goes up every time food is added or removed, so the arrays for nearest_many are only rebuilt then
+        self.version = 0
+        self.arrays_version = None
+        for food in foods:
+            self.add(food)
+
+    def __len__(self):
+        return self.count
+
+    def cell_of(self, point):
+        # points off the screen are put in the closest cell on the edge of the grid
+        col = min(max(int(point[0] // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(point[1] // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    def add(self, food):
+        col, row = self.cell_of(food.pos.center)
+        self.cells[col][row][food.id] = food
+        self.count += 1
+        self.region_counts[col // REGION][row // REGION] += 1
+        self.version += 1
+
+    def remove(self, food):
+        col, row = self.cell_of(food.pos.center)
+        if self.cells[col][row].pop(food.id, None) is not None:
+            self.count -= 1
+            self.region_counts[col // REGION][row // REGION] -= 1
+            self.version += 1
+
+    def nearest(self, point):
+        """Find the closest food to point. When two foods are the same distance away the newest one wins,
+        which is the same food that looping over the food list with <= would pick"""
+        if self.count == 0:
+            return None
+        x, y = point
+        col, row = self.cell_of(point)
+        closest_food = None
+        closest_key = None
+        # search rings of cells around the point until no cell further out can hold a closer food
+        for ring in range(max(self.cols, self.rows)):
+            if (
+                closest_key is not None
+                and (max(ring - 1, 0) * self.cell_size) ** 2 > closest_key[0]
+            ):
+                break
+            for c in range(col - ring, col + ring + 1):
+                if c < 0 or c >= self.cols:
+                    continue
+                # the sides of the ring are whole columns, everywhere else only the top and bottom cell
+                if c in (col - ring, col + ring):
+                    rows = range(row - ring, row + ring + 1)
+                else:
+                    rows = (row - ring, row + ring)
+                for r in rows:
+                    if r < 0 or r >= self.rows:
+                        continue
+                    for food in self.cells[c][r].values():
+                        dx = food.pos.centerx - x
+                        dy = food.pos.centery - y
+                        # closest distance first, then the newest food
+                        key = (dx * dx + dy * dy, -food.id)
+                        if closest_key is None or key < closest_key:
+                            closest_food = food
+                            closest_key = key
+        return closest_food
+
+    def nearest_in_cell(self, point):
+        """The closest food in the cell point is in, with the same tie break as nearest(), or None when that
+        cell has no food"""
+        x, y = point
+        col, row = self.cell_of(point)
+        closest_food = None
+        closest_key = None
+        for food in self.cells[col][row].values():
+            dx = food.pos.centerx - x
+            dy = food.pos.centery - y
+            key = (dx * dx + dy * dy, -food.id)
+            if closest_key is None or key < closest_key:
+                closest_food = food
+                closest_key = key
+        return closest_food
+
+    def densest_near(self, point):
+        """Where to head for food from point: the center of the cell next to point's cell with the most food,
+        or failing that of the cell in point's region with the most food, or failing that of the region next
+        to point's region with the most food. None when none of them have any. Ties go to the first one in
+        column then row order. Never looks at more than 8 + REGION * REGION + 8 counts
+        """
+        col, row = self.cell_of(point)
+        cell = self.densest(
+            [
+                (c, r)
+                for c in range(col - 1, col + 2)
+                for r in range(row - 1, row + 2)
+                if 0 <= c < self.cols and 0 <= r < self.rows
+            ],
+            lambda c, r: len(self.cells[c][r]),
+        )
+        if cell is None:
+            region_col, region_row = col // REGION, row // REGION
+            cell = self.densest(
+                [
+                    (c, r)
+                    for c in range(region_col * REGION, (region_col + 1) * REGION)
+                    for r in range(region_row * REGION, (region_row + 1) * REGION)
+                    if c < self.cols and r < self.rows
+                ],
+                lambda c, r: len(self.cells[c][r]),
+            )
+        if cell is not None:
+            return ((cell[0] + 0.5) * self.cell_size, (cell[1] + 0.5) * self.cell_size)
+
+        region = self.densest(
+            [
+                (c, r)
+                for c in range(region_col - 1, region_col + 2)
+                for r in range(region_row - 1, region_row + 2)
+                if 0 <= c < self.region_cols and 0 <= r < self.region_rows
+            ],
+            lambda c, r: self.region_counts[c][r],
+        )
+        if region is None:
+            return None
+        # the middle of the part of the region that is on the grid
+        size = REGION * self.cell_size
+        right = min((region[0] + 1) * size, self.cols * self.cell_size)
+        bottom = min((region[1] + 1) * size, self.rows * self.cell_size)
+        return ((region[0] * size + right) / 2, (region[1] * size + bottom) / 2)
+
+    @staticmethod
+    def densest(places, count):
+        """The place with the highest count above 0, None when they're all 0"""
+        best = None
+        best_count = 0
+        for place in places:
+            n = count(*place)
+            if n > best_count:
+                best = place
+                best_count = n
+        return best
+
+    def nearest_many(self, points):
+        """nearest() for many points at once, one numpy query against every food instead of a grid search for
+        each point. The same food is picked, ties included"""
+        if self.count == 0:
+            return [None] * len(points)
+        foods, food_x, food_y = self.arrays()
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        chunk = max(1, NEAREST_CHUNK // len(foods))
+        closest = []
+        for start in range(0, len(points), chunk):
+            p = points[start : start + chunk]
+            dx = food_x - p[:, 0, None]
+            dy = food_y - p[:, 1, None]
+            d2 = dx * dx
+            d2 += dy * dy
+            closest.extend(d2.argmin(axis=1).tolist())
+        return [foods[i] for i in closest]
+
+    def arrays(self):
+        """Every food and the x and y of its center, newest first so argmin, which takes the first of equal
+        distances, picks the newest food like nearest() does. Only rebuilt when the food has changed
+        """
+        if self.arrays_version != self.version:
+            foods = sorted(
+                (
+                    food
+                    for column in self.cells
+                    for cell in column
+                    for food in cell.values()
+                ),
+                key=lambda food: food.id,
+                reverse=True,
+            )
+            centers = np.array([food.pos.center for food in foods], dtype=np.int32)
+            self.food_arrays = (foods, centers[:, 0].copy(), centers[:, 1].copy())
+            self.arrays_version = self.version
+        return self.food_arrays
@@ -0,0 +1,263 @@
+import math
+import functools
+import random
+import pygame as pg
+import numpy as np
+
+pg.init()
+font = pg.font.SysFont(None, 24)
+
+
+@functools.lru_cache(maxsize=1024)
+def gen_render(gen):
+    # the render that is put on the middle of an organism, shared by every organism of the same generation
+    return font.render(str(gen), True, (255, 255, 255))
+
+
+class Organism:
+    # no __dict__ for each organism, so big populations take far less memory
+    __slots__ = (
+        "scenario",
+        "COLOR",
+        "gen",
+        "speed",
+        "age",
+        "max_age",
+        "energy",
+        "food_eaten",
+        "reproduce_food",
+        "litter_size",
+        "target_food",
+        "color_weights",
+        "pos",
+        "rng",
+    )
+
+    def __init__(
+        self,
+        pos,
+        color,
+        speed,
+        scenario,
+        gen=0,
+        color_weights=None,
+        max_age=None,
+        litter_size=None,
+        size=(20, 20),
+        rng=random,
+    ) -> None:
+        # the settings that decide how the organism mutates, see scenario.py
+        self.scenario = scenario
+        # where the organism and its children draw their random numbers from, the mutation stream of a
+        # RandomStreams in a simulation
+        self.rng = rng
+        self.COLOR = color
+        self.gen = gen
+        self.speed = speed
+        # number of frames that the organism has been alive
+        self.age = 0
+        # age of death
+        if max_age is None:
+            max_age = rng.randint(*scenario["start_max_age"])
+        if max_age >= scenario["max_age_cap"]:
+            max_age = rng.randint(*scenario["max_age_reset"])
+        self.max_age = max_age
+        # the energy of the organism which is the number of frames before it has to eat again before dying
+        if scenario["energy"] is not None:
+            self.energy = rng.randint(*scenario["energy"])
+
+        self.food_eaten = 0
+        # amount of food eaten before reproducing
+        self.reproduce_food = rng.randint(2, 4)
+        # max amount of children on reproduction, None when there is always one child
+        if litter_size is None and scenario["litter_size_max"] is not None:
+            litter_size = rng.randint(*scenario["start_litter_size"])
+        self.litter_size = litter_size
+        self.target_food = None
+        # weights for color change on reproduction
+        if color_weights is None:
+            color_weights = [
+                rng.randint(*scenario["start_color_weights"]) for _ in range(3)
+            ]
+        self.color_weights = color_weights
+
+        self.pos = pg.Rect(0, 0, *size)
+        self.pos.center = pos
+        self.regulate_stats()
+
+    @classmethod
+    def restore(cls, scenario, rng, topleft, size=(20, 20), **stats):
+        """An organism with exactly the stats it was saved with in a checkpoint, without drawing any random
+        numbers. stats are the values of every slot other than scenario, rng and pos"""
+        organism = cls.__new__(cls)
+        organism.scenario = scenario
+        organism.rng = rng
+        organism.pos = pg.Rect(topleft, size)
+        for name, value in stats.items():
+            setattr(organism, name, value)
+        return organism
+
+    def regulate_stats(self):
+        pass
+
+    def summon(self, screen):
+        pg.draw.rect(screen, self.COLOR, self.pos)
+        render = gen_render(self.gen)
+        screen.blit(
+            render,
+            (
+                self.pos.centerx - render.get_width() / 2,
+                self.pos.centery - render.get_height() / 2,
+            ),
+        )
+
+    def move(self, food_grid):
+        # eat clears the target of everything chasing a food as soon as it's eaten, so a target is always
+        # still there
+        if self.target_food is None:
+            return
+        # check if the organism is close enough to eat
+        if not self.pos.collidepoint(self.target_food.pos.center):
+            self.step_towards(self.target_food.pos.center)
+
+        else:
+            self.eat(food_grid)
+
+    def step_towards(self, point, stop_at_point=False):
+        """Move speed towards point, or only as far as point with stop_at_point"""
+        dx = point[0] - self.pos.centerx
+        dy = point[1] - self.pos.centery
+        d = math.hypot(dx, dy)
+        if stop_at_point and d <= self.speed:
+            self.pos.center = point
+            return
+        self.pos.centery += dy / d * self.speed
+        self.pos.centerx += dx / d * self.speed
+
+    def sense(self, food_grid):
+        """Density perception, see the perception scenario setting. Targets the closest food in the organism's
+        own grid cell, otherwise heads for where there is more food without targeting anything
+        """
+        food = food_grid.nearest_in_cell(self.pos.center)
+        if food is not None:
+            self.chase(food)
+            return
+        goal = food_grid.densest_near(self.pos.center)
+        if goal is not None:
+            # stopping on the middle of a cell instead of going past it, so it doesn't go back and forth
+            self.step_towards(goal, stop_at_point=True)
+
+    def eat(self, food_grid):
+        food = self.target_food
+        food.eaten = True
+        # out of the grid straight away so nothing targets it, and only the organisms chasing it look for
+        # new food, this one included
+        food_grid.remove(food)
+        for chaser in food.chasers:
+            chaser.target_food = None
+        food.chasers.clear()
+        self.food_eaten += 1
+        if self.scenario["energy"] is not None:
+            self.energy += self.scenario["energy_gain"]
+
+    def reproduce(self):
+        scenario = self.scenario
+        rng = self.rng
+        # create the new organism's color based on the parent's color plus a random number generated from the color_weights
+        # and kept between 0 and 255. everything here stays python ints and floats, numpy is slower on single numbers
+        color = tuple(
+            min(max(i + rng.randint(-cw, cw), 0), 255)
+            for i, cw in zip(self.COLOR, self.color_weights)
+        )
+        # create new color weights based on parent's color weights plus a random number, at most color_weight_max
+        color_weight_max = scenario["color_weight_max"]
+        color_weights = tuple(
+            min(abs(rng.randint(cw - 1, cw + 1)), color_weight_max)
+            for cw in self.color_weights
+        )
+
+        litter_size = None
+        if self.litter_size is not None:
+            # generate new litter size based on parents litter size plus a random number
+            litter_size = min(
+                abs(rng.randint(self.litter_size - 1, self.litter_size + 1)),
+                scenario["litter_size_max"],
+            )
+
+        speed_down, speed_up = scenario["speed_mutation"]
+        age_down, age_up = scenario["max_age_mutation"]
+        return Organism(
+            self.pos.topleft,
+            color=color,
+            color_weights=color_weights,
+            speed=round(
+                rng.uniform(self.speed - speed_down, self.speed + speed_up),
+                scenario["speed_digits"],
+            ),
+            scenario=scenario,
+            gen=self.gen + 1,
+            max_age=rng.randint(self.max_age - age_down, self.max_age + age_up),
+            litter_size=litter_size,
+            rng=rng,
+        )
+
+    def reproduce_litter(self, n, batch_rng):
+        """n children at once, like calling reproduce n times but with the mutations of the whole litter drawn
+        in one call to batch_rng, a numpy Generator like the mutation_batch stream of a RandomStreams
+        """
+        scenario = self.scenario
+        speed_down, speed_up = scenario["speed_mutation"]
+        age_down, age_up = scenario["max_age_mutation"]
+        litter_size = self.litter_size or 0
+        # every mutation is low + u * span for a uniform u, rounded down for the whole number ones. columns are
+        # the 3 colors, the 3 color weights, the litter size, the max age and the speed
+        low = np.array(
+            [c - cw for c, cw in zip(self.COLOR, self.color_weights)]
+            + [cw - 1 for cw in self.color_weights]
+            + [litter_size - 1, self.max_age - age_down, self.speed - speed_down]
+        )
+        span = np.array(
+            [2 * cw + 1 for cw in self.color_weights]
+            + [3, 3, 3, 3, age_down + age_up + 1, speed_down + speed_up]
+        )
+        values = low + batch_rng.random((n, 9)) * span
+        whole = np.floor(values[:, :8]).astype(np.int64)
+        colors = np.clip(whole[:, :3], 0, 255)
+        color_weights = np.minimum(np.abs(whole[:, 3:6]), scenario["color_weight_max"])
+        litter_sizes = [None] * n
+        if self.litter_size is not None:
+            litter_sizes = np.minimum(
+                np.abs(whole[:, 6]), scenario["litter_size_max"]
+            ).tolist()
+        speeds = np.round(values[:, 8], scenario["speed_digits"])
+        return [
+            Organism(
+                self.pos.topleft,
+                color=tuple(color),
+                color_weights=tuple(weights),
+                speed=speed,
+                scenario=scenario,
+                gen=self.gen + 1,
+                max_age=max_age,
+                litter_size=litter_size,
+                rng=self.rng,
+            )
+            # tolist gives python ints and floats, so the children have no numpy numbers in them
+            for color, weights, speed, max_age, litter_size in zip(
+                colors.tolist(),
+                color_weights.tolist(),
+                speeds.tolist(),
+                whole[:, 7].tolist(),
+                litter_sizes,
+            )
+        ]
+
+    def target(self, food_grid):
+        # find the closest food using the grid instead of checking every food
+        self.chase(food_grid.nearest(self.pos.center))
+
+    def chase(self, food):
+        self.target_food = food
+        if food is not None:
+            # so the food can tell this organism when it's eaten
+            food.chasers.add(self)
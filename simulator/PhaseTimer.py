@@ -0,0 +1,81 @@
+import csv
+import time
+
+# the phases of a frame in the order they happen, a headless run only has spawn, cleanup, organisms and stats
+PHASES = ("events", "spawn", "cleanup", "organisms", "stats", "draw", "flip", "idle")
+
+
+class PhaseTimer:
+    """Times each phase of a frame. lap(phase) adds the time since the last lap to that phase, so the phases
+    are timed one after the other with one perf_counter call each, and it does nothing at all while the
+    timer is off. Keeps an average of the last frames for the on screen overlay, the total of the whole
+    run, and writes every frame's times to a csv trace when given one"""
+
+    def __init__(self, enabled=False, trace=None, smoothing=0.05) -> None:
+        self.enabled = enabled
+        # how much of each new frame goes into the average, smaller is steadier
+        self.smoothing = smoothing
+        # seconds of each phase in the frame so far
+        self.frame = dict.fromkeys(PHASES, 0.0)
+        # ms of each phase averaged over the last frames
+        self.average = dict.fromkeys(PHASES, 0.0)
+        self.total = dict.fromkeys(PHASES, 0.0)
+        self.last = time.perf_counter()
+        self.trace_file = self.trace = None
+        if trace is not None:
+            self.trace_file = open(trace, "w", newline="")
+            self.trace = csv.writer(self.trace_file)
+            self.trace.writerow(["frame", "population", *PHASES])
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        # the time while it was off isn't any phase's
+        self.restart()
+
+    def restart(self):
+        """Start the frame from now, dropping anything timed so far"""
+        self.last = time.perf_counter()
+        self.frame = dict.fromkeys(PHASES, 0.0)
+
+    def lap(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame[phase] += now - self.last
+        self.last = now
+
+    def end_frame(self, frames_passed, population):
+        if not self.enabled:
+            return
+        frame = self.frame
+        for phase, seconds in frame.items():
+            self.average[phase] += (
+                seconds * 1000 - self.average[phase]
+            ) * self.smoothing
+            self.total[phase] += seconds
+        if self.trace is not None:
+            self.trace.writerow(
+                [frames_passed, population, *(f"{frame[p] * 1000:.4f}" for p in PHASES)]
+            )
+        self.frame = dict.fromkeys(PHASES, 0.0)
+        # writing the trace isn't part of the next frame
+        self.last = time.perf_counter()
+
+    def overlay(self):
+        """Lines of text for the overlay, the average ms of each phase and of the whole frame"""
+        lines = [f"{phase}: {ms:.2f} ms" for phase, ms in self.average.items()]
+        lines.append(f"frame: {sum(self.average.values()):.2f} ms")
+        return lines
+
+    def summary(self):
+        """The total time of each phase over the whole run and its share of all of it"""
+        run = sum(self.total.values()) or 1
+        return ", ".join(
+            f"{phase} {seconds:.3f}s ({seconds / run:.1%})"
+            for phase, seconds in self.total.items()
+            if seconds
+        )
+
+    def close(self):
+        if self.trace_file is not None:
+            self.trace_file.close()
@@ -0,0 +1,109 @@
+import numpy as np
+
+
+class PopulationStats:
+    """Running totals of the organism stats that are gathered, kept up to date as organisms are born and die,
+    so reading them never goes over the population and they can be gathered every frame. The highest
+    generation comes from how many organisms there are of each generation, and moves down to the next one
+    with any organisms left when the last of its generation dies.
+
+    Speeds are added up as whole numbers of their smallest digit, so adding and taking away the same speeds
+    always comes back to exactly the same total
+    """
+
+    def __init__(self, speed_digits) -> None:
+        # starting speeds have 3 digits, children's have speed_digits
+        self.speed_unit = 10 ** max(3, speed_digits)
+        self.population = 0
+        self.gen_total = 0
+        # the difference between 128 (the starting rgb value) and the current value is the mutation value
+        self.mut_total = 0
+        self.speed_total = 0
+        self.max_age_total = 0
+        self.litter_size_total = 0
+        # how many organisms there are of each generation
+        self.gen_counts = [0]
+        self.highest_gen = 0
+
+    def add(self, organism):
+        """Count a newly born Organism"""
+        self.population += 1
+        gen = organism.gen
+        self.gen_total += gen
+        r, g, b = organism.COLOR
+        self.mut_total += abs(128 - r) + abs(128 - g) + abs(128 - b)
+        self.speed_total += round(organism.speed * self.speed_unit)
+        self.max_age_total += organism.max_age
+        if organism.litter_size is not None:
+            self.litter_size_total += organism.litter_size
+        if gen >= len(self.gen_counts):
+            self.gen_counts.extend([0] * (gen + 1 - len(self.gen_counts)))
+        self.gen_counts[gen] += 1
+        if gen > self.highest_gen:
+            self.highest_gen = gen
+
+    def remove(self, organism):
+        """Stop counting an Organism that died"""
+        self.population -= 1
+        gen = organism.gen
+        self.gen_total -= gen
+        r, g, b = organism.COLOR
+        self.mut_total -= abs(128 - r) + abs(128 - g) + abs(128 - b)
+        self.speed_total -= round(organism.speed * self.speed_unit)
+        self.max_age_total -= organism.max_age
+        if organism.litter_size is not None:
+            self.litter_size_total -= organism.litter_size
+        self.gen_counts[gen] -= 1
+        self.lower_highest_gen()
+
+    def add_arrays(self, orgs):
+        """add for every organism in the arrays of a VectorWorld"""
+        self.count_arrays(orgs, 1)
+
+    def remove_arrays(self, orgs):
+        """remove for every organism in the arrays of a VectorWorld"""
+        self.count_arrays(orgs, -1)
+        self.lower_highest_gen()
+
+    def count_arrays(self, orgs, sign):
+        gen = orgs["gen"]
+        if len(gen) == 0:
+            return
+        self.population += sign * len(gen)
+        self.gen_total += sign * int(gen.sum())
+        self.mut_total += sign * int(np.abs(128 - orgs["color"]).sum())
+        self.speed_total += sign * int(
+            np.rint(orgs["speed"] * self.speed_unit).astype(np.int64).sum()
+        )
+        self.max_age_total += sign * int(orgs["max_age"].sum())
+        self.litter_size_total += sign * int(orgs["litter_size"].sum())
+        gens, counts = np.unique(gen, return_counts=True)
+        highest = int(gens[-1])
+        if highest >= len(self.gen_counts):
+            self.gen_counts.extend([0] * (highest + 1 - len(self.gen_counts)))
+        for g, count in zip(gens.tolist(), counts.tolist()):
+            self.gen_counts[g] += sign * count
+        if highest > self.highest_gen:
+            self.highest_gen = highest
+
+    def lower_highest_gen(self):
+        # only ever moves down as far as it has moved up, so this is constant time over a run
+        while self.highest_gen > 0 and self.gen_counts[self.highest_gen] == 0:
+            self.highest_gen -= 1
+
+    def averages(self, speed_stat_scale):
+        """The population, highest generation and the average of every stat, 0 when there are no organisms"""
+        population = self.population or 1
+        return {
+            "population": self.population,
+            "avg_gen": self.gen_total / population,
+            "highest_gen": self.highest_gen,
+            "avg_mut": self.mut_total / population,
+            # multiplied by speed_stat_scale to make the data easier to read on graph
+            "avg_speed": self.speed_total
+            / self.speed_unit
+            * speed_stat_scale
+            / population,
+            "avg_max_age": self.max_age_total / population,
+            "avg_litter_size": self.litter_size_total / population,
+        }
@@ -0,0 +1,98 @@
+import numpy as np
+import pygame as pg
+from .Organism import gen_render
+
+FOOD_COLOR = (90, 200, 150)
+# below this many organisms drawing each one on its own is quicker than the pass over the whole screen
+BULK_MIN = 2000
+
+
+def window_max(a, width, axis):
+    """out[i] = max(a[i - width + 1], ..., a[i]) along axis, using doubling shifts instead of a loop over the window"""
+    out = a.copy()
+    span = 1
+    while span < width:
+        shift = min(span, width - span)
+        src = [slice(None)] * a.ndim
+        dst = [slice(None)] * a.ndim
+        src[axis] = slice(None, -shift)
+        dst[axis] = slice(shift, None)
+        np.maximum(out[tuple(dst)], out[tuple(src)], out=out[tuple(dst)])
+        span += shift
+    return out
+
+
+class Renderer:
+    """Draws every organism in one pass over the screen's pixels instead of one draw call per organism.
+
+    Organisms are all the same size, so the organism drawn on top at a pixel is the newest one whose top left
+    corner is within one organism size up and to the left of it. That is a sliding window max over an image
+    of organism indexes, which costs the same whatever the population is."""
+
+    def __init__(self, size=(20, 20), label_limit=500, bulk=True) -> None:
+        self.size = size
+        # generation labels are only drawn while there are at most this many organisms
+        self.label_limit = label_limit
+        # bulk=False draws each organism and food with its own draw call like before
+        self.bulk = bulk
+
+    def summon(self, screen, world):
+        if not self.bulk:
+            world.summon(screen)
+            return
+        arrays = world.render_arrays()
+        for pos, size in zip(arrays["food_pos"].tolist(), arrays["food_size"].tolist()):
+            rect = pg.Rect(0, 0, *size)
+            rect.center = pos
+            pg.draw.rect(screen, FOOD_COLOR, rect)
+        self.draw_organisms(screen, arrays["pos"], arrays["color"])
+        if 0 < len(arrays["gen"]) <= self.label_limit:
+            self.draw_labels(screen, arrays["pos"], arrays["gen"])
+
+    def draw_organisms(self, screen, pos, color):
+        if len(pos) < BULK_MIN:
+            rect = pg.Rect(0, 0, *self.size)
+            for center, c in zip(pos.tolist(), np.asarray(color).tolist()):
+                rect.center = center
+                pg.draw.rect(screen, c, rect)
+            return
+        w, h = self.size
+        screen_w, screen_h = screen.get_size()
+        # the index image is padded so organisms hanging off the top or left still count
+        top_left = pos - np.array(self.size) // 2 + (w - 1, h - 1)
+        on_screen = np.all(
+            (top_left >= 0) & (top_left < (screen_w + w - 1, screen_h + h - 1)), axis=1
+        )
+        idx = np.flatnonzero(on_screen)
+        top_left = top_left[idx]
+        owner = np.full((screen_w + w - 1, screen_h + h - 1), -1, dtype=np.int32)
+        np.maximum.at(owner, (top_left[:, 0], top_left[:, 1]), idx.astype(np.int32))
+        owner = window_max(window_max(owner, w, 0), h, 1)[w - 1 :, h - 1 :]
+
+        drawn = owner >= 0
+        color = np.asarray(color)
+        if screen.get_bytesize() == 4:
+            # write whole pixels at once, packed the way the screen stores them
+            shifts = screen.get_shifts()
+            mapped = (
+                (color[:, 0] << shifts[0])
+                | (color[:, 1] << shifts[1])
+                | (color[:, 2] << shifts[2])
+                | screen.get_masks()[3]
+            )
+            pixels = pg.surfarray.pixels2d(screen)
+            np.copyto(pixels, mapped[owner], where=drawn, casting="unsafe")
+        else:
+            pixels = pg.surfarray.pixels3d(screen)
+            pixels[drawn] = color[owner[drawn]]
+        # the pixel array locks the screen until it is gone
+        del pixels
+
+    def draw_labels(self, screen, pos, gen):
+        blits = []
+        for (x, y), g in zip(pos.tolist(), gen.tolist()):
+            render = gen_render(g)
+            blits.append(
+                (render, (x - render.get_width() / 2, y - render.get_height() / 2))
+            )
+        screen.blits(blits, doreturn=False)
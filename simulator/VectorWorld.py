@@ -0,0 +1,387 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pygame as pg
+from .scenario import make_scenario
+from .PopulationStats import PopulationStats
+from .streams import RandomStreams
+
+# the distance matrix used for targeting is split into chunks of about this many entries
+TARGET_CHUNK = 2_000_000
+
+
+def randint(rng, low, high, n=None):
+    # inclusive on both ends like random.randint
+    return rng.integers(low, high + 1, n)
+
+
+class VectorWorld:
+    """Every organism and food stored as numpy arrays, one entry per organism/food, so a whole frame
+    is a handful of array operations instead of a python loop over the organisms"""
+
+    def __init__(
+        self,
+        scenario=None,
+        max_population=10000,
+        size=(20, 20),
+        seed=None,
+        workers=1,
+    ) -> None:
+        # the settings of the simulation, see scenario.py
+        self.scenario = scenario = make_scenario(scenario or {})
+        if scenario["perception"] != "nearest":
+            raise ValueError(
+                f"the vector engine only has nearest perception, not {scenario['perception']}"
+            )
+        # every random number of the simulation comes from here, so the same seed gives the same run
+        self.streams = streams = RandomStreams(seed)
+        # random numbers for everything an organism is born with
+        self.rng = streams.mutation_batch
+        self.max_age_cap = scenario["max_age_cap"]
+        self.max_age_reset = scenario["max_age_reset"]
+        self.color_weight_max = scenario["color_weight_max"]
+        # None means every reproduction has exactly one child
+        self.litter_size_max = scenario["litter_size_max"]
+        self.speed_mutation = scenario["speed_mutation"]
+        self.speed_digits = scenario["speed_digits"]
+        self.max_age_mutation = scenario["max_age_mutation"]
+        # None means organisms don't use energy
+        self.energy = scenario["energy"]
+        self.energy_gain = scenario["energy_gain"]
+        # food is spawned when a 1 in food_chance roll comes up
+        self.food_chance = scenario["food_chance"]
+        self.food_spawn = scenario["food_spawn"]
+        # the order the loop in main.py goes through the organisms, which decides who gets a food first
+        self.newest_first = scenario["newest_first"]
+        self.max_population = max_population
+        self.size = size
+        # threads targeting is split over. numpy lets go of the GIL for the distance maths, so they run on
+        # separate cores. the pool is made the first time it's needed
+        self.workers = workers
+        self.pool = None
+
+        start_colors = scenario["start_colors"]
+        n = len(start_colors)
+        # like start_sim in main.py, the starting color weights, max age and litter size are drawn once
+        # and shared by every starting organism
+        color_weights = self.randint(*scenario["start_color_weights"], 3)
+        self.orgs = {
+            "pos": np.stack(
+                [
+                    randint(streams.placement_batch, 100, 900, n),
+                    randint(streams.placement_batch, 100, 650, n),
+                ],
+                axis=1,
+            ),
+            "color": np.array(start_colors, dtype=np.int64).reshape(n, 3),
+            "color_weights": np.tile(color_weights, (n, 1)),
+            "speed": np.round(self.rng.uniform(*scenario["start_speed"], n), 3),
+            "gen": np.zeros(n, dtype=np.int64),
+            "age": np.zeros(n, dtype=np.int64),
+            "max_age": np.full(n, self.randint(*scenario["start_max_age"])),
+            "food_eaten": np.zeros(n, dtype=np.int64),
+            "reproduce_food": self.randint(2, 4, n),
+            "litter_size": self.start_litter_size(n),
+            "energy": self.start_energy(n),
+            # index of the targeted food, -1 for no target
+            "target": np.full(n, -1, dtype=np.int64),
+        }
+        self.orgs["max_age"] = self.regulate_max_age(self.orgs["max_age"])
+        self.recount()
+
+        self.foods = {
+            "pos": np.zeros((0, 2), dtype=np.int64),
+            "size": np.zeros((0, 2), dtype=np.int64),
+            "eaten": np.zeros(0, dtype=bool),
+        }
+        self.add_food(scenario["food_amount"], (20, 40))
+
+    def __len__(self):
+        return len(self.orgs["gen"])
+
+    def close(self):
+        """Stop the targeting threads, when any were started"""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def recount(self):
+        """Count every organism into new running stats, for when orgs is replaced as a whole"""
+        self.stats = PopulationStats(self.scenario["speed_digits"])
+        self.stats.add_arrays(self.orgs)
+
+    def randint(self, low, high, n=None):
+        # inclusive on both ends like random.randint, from the mutation stream
+        return randint(self.rng, low, high, n)
+
+    def start_energy(self, n):
+        if self.energy is None:
+            return np.zeros(n, dtype=np.int64)
+        return self.randint(*self.energy, n)
+
+    def start_litter_size(self, n):
+        # like start_sim, organisms that always have one child have no litter size, kept as 0 here
+        if self.litter_size_max is None:
+            return np.zeros(n, dtype=np.int64)
+        return np.full(n, self.randint(*self.scenario["start_litter_size"]))
+
+    def regulate_max_age(self, max_age):
+        too_old = max_age >= self.max_age_cap
+        max_age[too_old] = self.randint(*self.max_age_reset, int(too_old.sum()))
+        return max_age
+
+    def add_food(self, amount, size_range):
+        pos = np.stack(
+            [
+                randint(self.streams.placement_batch, 50, 850, amount),
+                randint(self.streams.placement_batch, 50, 600, amount),
+            ],
+            axis=1,
+        )
+        size = randint(self.streams.spawn_batch, *size_range, (amount, 2))
+        self.foods["pos"] = np.concatenate([self.foods["pos"], pos])
+        self.foods["size"] = np.concatenate([self.foods["size"], size])
+        self.foods["eaten"] = np.concatenate(
+            [self.foods["eaten"], np.zeros(amount, dtype=bool)]
+        )
+
+    def step(self, timer=None):
+        """One frame, in the same order as the loop in main.py, timing each phase with timer when given one"""
+        spawn = self.streams.spawn_batch
+        if randint(spawn, 1, self.food_chance) == 2:
+            self.add_food(int(randint(spawn, *self.food_spawn)), (10, 20))
+        if timer is not None:
+            timer.lap("spawn")
+        self.remove_eaten_food()
+        self.remove_dead()
+        if timer is not None:
+            timer.lap("cleanup")
+        self.target()
+        self.move()
+        born_before = len(self)
+        self.reproduce()
+        # going newest first the loop in main.py never gets to the children born this frame, so they don't age
+        aging = slice(born_before if self.newest_first else None)
+        if self.energy is not None:
+            self.orgs["energy"][aging] -= 1
+        self.orgs["age"][aging] += 1
+        if timer is not None:
+            timer.lap("organisms")
+
+    def remove_eaten_food(self):
+        eaten = self.foods["eaten"]
+        if not eaten.any():
+            return
+        # new index of every food once the eaten ones are gone
+        new_index = np.cumsum(~eaten) - 1
+        new_index[eaten] = -1
+        for key in self.foods:
+            self.foods[key] = self.foods[key][~eaten]
+        target = self.orgs["target"]
+        has_target = target >= 0
+        target[has_target] = new_index[target[has_target]]
+
+    def remove_dead(self):
+        dead = self.orgs["age"] > self.orgs["max_age"]
+        if self.energy is not None:
+            dead |= self.orgs["energy"] <= 0
+        if dead.any():
+            self.stats.remove_arrays(
+                {key: values[dead] for key, values in self.orgs.items()}
+            )
+            for key in self.orgs:
+                self.orgs[key] = self.orgs[key][~dead]
+
+    def target(self):
+        """Target the closest food for every organism without one. Ties go to the newest food like Organism.target"""
+        food_pos = self.foods["pos"]
+        need = np.flatnonzero(self.orgs["target"] < 0)
+        if len(food_pos) == 0 or len(need) == 0:
+            return
+        if self.workers > 1 and len(need) * len(food_pos) > TARGET_CHUNK:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(self.workers)
+            # one horizontal band of the world for each worker. every organism writes only its own target,
+            # so the result is exactly the same as doing them all in one go
+            band = np.clip(
+                self.orgs["pos"][need, 1] * self.workers // 700, 0, self.workers - 1
+            )
+            order = np.argsort(band, kind="stable")
+            tiles = np.split(
+                need[order], np.searchsorted(band[order], range(1, self.workers))
+            )
+            list(self.pool.map(self.target_group, tiles))
+        else:
+            self.target_group(need)
+
+    def target_group(self, need):
+        """target() for the organisms at the indexes in need, out of the food that hasn't been eaten"""
+        food_pos = self.foods["pos"]
+        # food is only eaten before targeting when move retargets the organisms that lost their food
+        uneaten = None
+        if self.foods["eaten"].any():
+            uneaten = np.flatnonzero(~self.foods["eaten"])
+            food_pos = food_pos[uneaten]
+        # the workers share one TARGET_CHUNK between them so running together doesn't need more memory
+        chunk = max(1, TARGET_CHUNK // self.workers // len(food_pos))
+        # reversed so argmin, which takes the first of equal distances, picks the newest food
+        food_x = food_pos[::-1, 0].astype(np.int32)
+        food_y = food_pos[::-1, 1].astype(np.int32)
+        for start in range(0, len(need), chunk):
+            idx = need[start : start + chunk]
+            pos = self.orgs["pos"][idx].astype(np.int32)
+            dx = food_x - pos[:, 0, None]
+            dy = food_y - pos[:, 1, None]
+            d2 = dx * dx
+            d2 += dy * dy
+            chosen = len(food_pos) - 1 - d2.argmin(axis=1)
+            self.orgs["target"][idx] = chosen if uneaten is None else uneaten[chosen]
+
+    def move(self):
+        """Move every organism with a target and eat the food they reach. Like the loop in main.py, an
+        organism whose food is eaten by one the loop goes through before it targets another food and moves
+        in the same frame, so this goes on until none are left"""
+        movers = np.flatnonzero(self.orgs["target"] >= 0)
+        while len(movers) > 0:
+            movers = self.move_group(movers)
+
+    def move_group(self, movers):
+        """Move the organisms at the indexes in movers, which all have a target. Returns the ones that lost
+        their food to an organism the loop goes through before them, already retargeted
+        """
+        target = self.orgs["target"]
+        pos = self.orgs["pos"]
+        food_pos = self.foods["pos"][target[movers]]
+        half = np.array(self.size) // 2
+        # the same check as pg.Rect.collidepoint on the organism's rect
+        left_top = pos[movers] - half
+        collide = np.all(
+            (left_top <= food_pos) & (food_pos < left_top + self.size), axis=1
+        )
+
+        # when several organisms reach the same food this frame the first one the loop in main.py would go
+        # through gets it, the newest with newest_first
+        reached = movers[collide]
+        if self.newest_first:
+            reached = reached[::-1]
+        foods_reached, first = np.unique(target[reached], return_index=True)
+        eaters = reached[first]
+        self.foods["eaten"][foods_reached] = True
+        self.orgs["food_eaten"][eaters] += 1
+        if self.energy is not None:
+            self.orgs["energy"][eaters] += self.energy_gain
+
+        # who ate each mover's food, -1 when it's still there
+        eater_of = np.full(len(self.foods["eaten"]), -1)
+        eater_of[foods_reached] = eaters
+        eaten_by = eater_of[target[movers]]
+        lost = (eaten_by >= 0) & (eaten_by != movers)
+        # the ones the loop goes through after the eater find out before they move. the ones before it have
+        # already moved towards the food by the time it's eaten
+        if self.newest_first:
+            late = lost & (movers < eaten_by)
+        else:
+            late = lost & (movers > eaten_by)
+        walkers = movers[~collide & ~late]
+        delta = self.foods["pos"][target[walkers]] - pos[walkers]
+        d = np.hypot(delta[:, 0], delta[:, 1])
+        step = delta / d[:, None] * self.orgs["speed"][walkers, None]
+        # rect positions are whole numbers, rounded the same way pygame does
+        pos[walkers] = np.floor(pos[walkers] + step + 0.5).astype(np.int64)
+        target[movers[lost]] = -1
+
+        late = movers[late]
+        if len(late) == 0 or self.foods["eaten"].all():
+            return late[:0]
+        self.target_group(late)
+        return late
+
+    def reproduce(self):
+        orgs = self.orgs
+        parents = np.flatnonzero(orgs["food_eaten"] >= orgs["reproduce_food"])
+        if len(parents) == 0:
+            return
+        # in the order the loop in main.py goes through them, so the same parents get under the population cap
+        # and the children are in the order they're born
+        if self.newest_first:
+            parents = parents[::-1]
+        if self.litter_size_max is None:
+            litters = np.ones(len(parents), dtype=np.int64)
+        else:
+            litters = self.randint(0, orgs["litter_size"][parents])
+        # the population cap is checked before each parent like the loop in main.py
+        born_before = np.cumsum(litters) - litters
+        allowed = len(self) + born_before < self.max_population
+        parents = parents[allowed]
+        litters = litters[allowed]
+        orgs["food_eaten"][parents] = 0
+
+        p = np.repeat(parents, litters)
+        n = len(p)
+        if n == 0:
+            return
+        cw = orgs["color_weights"][p]
+        color = np.clip(orgs["color"][p] + self.rng.integers(-cw, cw + 1), 0, 255)
+        color_weights = np.clip(
+            np.abs(self.rng.integers(cw - 1, cw + 2)), 0, self.color_weight_max
+        )
+        litter_size = orgs["litter_size"][p]
+        if self.litter_size_max is not None:
+            litter_size = np.clip(
+                np.abs(self.rng.integers(litter_size - 1, litter_size + 2)),
+                0,
+                self.litter_size_max,
+            )
+        speed = orgs["speed"][p]
+        speed = np.round(
+            self.rng.uniform(
+                speed - self.speed_mutation[0], speed + self.speed_mutation[1]
+            ),
+            self.speed_digits,
+        )
+        max_age = orgs["max_age"][p]
+        max_age = self.regulate_max_age(
+            self.rng.integers(
+                max_age - self.max_age_mutation[0],
+                max_age + self.max_age_mutation[1] + 1,
+            )
+        )
+        children = {
+            # children start on the parent's top left corner like Organism.reproduce
+            "pos": orgs["pos"][p] - np.array(self.size) // 2,
+            "color": color,
+            "color_weights": color_weights,
+            "speed": speed,
+            "gen": orgs["gen"][p] + 1,
+            "age": np.zeros(n, dtype=np.int64),
+            "max_age": max_age,
+            "food_eaten": np.zeros(n, dtype=np.int64),
+            "reproduce_food": self.randint(2, 4, n),
+            "litter_size": litter_size,
+            "energy": self.start_energy(n),
+            "target": np.full(n, -1, dtype=np.int64),
+        }
+        for key in orgs:
+            orgs[key] = np.concatenate([orgs[key], children[key]])
+        self.stats.add_arrays(children)
+
+    def render_arrays(self):
+        uneaten = ~self.foods["eaten"]
+        return {
+            "food_pos": self.foods["pos"][uneaten],
+            "food_size": self.foods["size"][uneaten],
+            "pos": self.orgs["pos"],
+            "color": self.orgs["color"],
+            "gen": self.orgs["gen"],
+        }
+
+    def summon(self, screen):
+        # food eaten this frame is still in the arrays until the next frame, like render_arrays it isn't drawn
+        uneaten = ~self.foods["eaten"]
+        for pos, size in zip(self.foods["pos"][uneaten], self.foods["size"][uneaten]):
+            rect = pg.Rect(0, 0, *size)
+            rect.center = pos
+            pg.draw.rect(screen, (90, 200, 150), rect)
+        rect = pg.Rect(0, 0, *self.size)
+        for pos, color in zip(self.orgs["pos"], self.orgs["color"]):
+            rect.center = pos
+            pg.draw.rect(screen, color, rect)
@@ -0,0 +1,2 @@
+"""The natural selection simulator. Every scenario runs on the same engine, the differences between them
+are the settings in their scenario file, see scenario.py"""
@@ -0,0 +1,172 @@
+import json
+import time
+import zipfile
+import numpy as np
+from .Food import Food, FoodGrid
+from .Organism import Organism
+from .VectorWorld import VectorWorld
+
+# bump when the layout of a checkpoint changes so old files are refused instead of loaded wrong
+VERSION = 1
+# the stats of an Organism saved as one array each, in the same order as __slots__
+ORGANISM_STATS = [
+    "COLOR",
+    "gen",
+    "speed",
+    "age",
+    "max_age",
+    "energy",
+    "food_eaten",
+    "reproduce_food",
+    "litter_size",
+    "color_weights",
+]
+
+
+def save_checkpoint(path, world, data, frames_passed):
+    """Save everything needed to carry on the run later to path as a compressed .npz: the organisms and
+    food as arrays, and the scenario, random number streams, data and frames_passed as json
+    """
+    vector = isinstance(world, VectorWorld)
+    data = dict(data)
+    # times are saved as how long the run had been going so they carry on from where they were
+    data["start_time"] = time.time() - data["start_time"]
+    meta = {
+        "version": VERSION,
+        "engine": "vector" if vector else "object",
+        "scenario": world.scenario,
+        "max_population": world.max_population,
+        "seed": world.streams.seed,
+        "streams": world.streams.get_state(),
+        "frames_passed": frames_passed,
+        "data": data,
+    }
+    arrays = vector_arrays(world) if vector else object_arrays(world)
+    np.savez_compressed(path, meta=np.array(json.dumps(meta, default=float)), **arrays)
+
+
+def load_checkpoint(path):
+    """The world, data and frames_passed saved in path by save_checkpoint. Raises ValueError when path isn't
+    a checkpoint this simulator can read, and OSError when it can't be read at all"""
+    try:
+        with np.load(path) as saved:
+            meta = json.loads(str(saved["meta"]))
+            arrays = {key: saved[key] for key in saved.files if key != "meta"}
+    # what np.load raises for files that aren't an .npz with a meta in it
+    except (ValueError, KeyError, TypeError, EOFError, zipfile.BadZipFile) as e:
+        raise ValueError(f"{path} is not a checkpoint") from e
+    if meta.get("version") != VERSION:
+        raise ValueError(
+            f"{path} is a version {meta.get('version')} checkpoint, this simulator reads version {VERSION}"
+        )
+    if meta["engine"] == "vector":
+        world = restore_vector(meta, arrays)
+    else:
+        world = restore_object(meta, arrays)
+    world.streams.set_state(meta["streams"])
+
+    data = meta["data"]
+    data["start_time"] = time.time() - data["start_time"]
+    return world, data, meta["frames_passed"]
+
+
+def vector_arrays(world):
+    arrays = {f"orgs_{key}": value for key, value in world.orgs.items()}
+    arrays.update({f"foods_{key}": value for key, value in world.foods.items()})
+    return arrays
+
+
+def restore_vector(meta, arrays):
+    world = VectorWorld(meta["scenario"], meta["max_population"], seed=meta["seed"])
+    world.orgs = {key: arrays[f"orgs_{key}"] for key in world.orgs}
+    world.foods = {key: arrays[f"foods_{key}"] for key in world.foods}
+    world.recount()
+    return world
+
+
+def object_arrays(world):
+    foods = world.foods
+    food_index = {id(food): i for i, food in enumerate(foods)}
+    organisms = world.organisms
+    uses_energy = world.scenario["energy"] is not None
+    arrays = {
+        "foods_id": np.array([food.id for food in foods], dtype=np.int64),
+        "foods_size": np.array([food.size for food in foods], dtype=np.int64),
+        "foods_topleft": np.array([food.pos.topleft for food in foods], dtype=np.int64),
+        "foods_eaten": np.array([food.eaten for food in foods], dtype=bool),
+        "orgs_topleft": np.array(
+            [org.pos.topleft for org in organisms], dtype=np.int64
+        ),
+        "orgs_target_food": np.array(
+            [
+                (-1 if org.target_food is None else food_index[id(org.target_food)])
+                for org in organisms
+            ],
+            dtype=np.int64,
+        ),
+    }
+    for stat in ORGANISM_STATS:
+        if stat == "energy" and not uses_energy:
+            continue
+        values = [getattr(org, stat) for org in organisms]
+        if stat == "litter_size":
+            # -1 for organisms that always have one child
+            values = [-1 if value is None else value for value in values]
+        arrays[f"orgs_{stat}"] = np.array(values)
+    # keeps the shapes right when there are no organisms or food
+    arrays["foods_size"] = arrays["foods_size"].reshape(-1, 2)
+    arrays["foods_topleft"] = arrays["foods_topleft"].reshape(-1, 2)
+    arrays["orgs_topleft"] = arrays["orgs_topleft"].reshape(-1, 2)
+    return arrays
+
+
+def restore_object(meta, arrays):
+    # imported here because main imports this module
+    from .main import ObjectWorld
+
+    world = ObjectWorld(meta["scenario"], meta["max_population"], seed=meta["seed"])
+    foods = [
+        Food.restore(id, tuple(size), tuple(topleft), eaten)
+        for id, size, topleft, eaten in zip(
+            arrays["foods_id"].tolist(),
+            arrays["foods_size"].tolist(),
+            arrays["foods_topleft"].tolist(),
+            arrays["foods_eaten"].tolist(),
+        )
+    ]
+    if foods:
+        Food.reserve_ids(max(food.id for food in foods))
+
+    stats = {
+        stat: arrays[f"orgs_{stat}"].tolist()
+        for stat in ORGANISM_STATS
+        if f"orgs_{stat}" in arrays
+    }
+    stats["COLOR"] = [tuple(color) for color in stats["COLOR"]]
+    stats["color_weights"] = [tuple(weights) for weights in stats["color_weights"]]
+    stats["litter_size"] = [None if size < 0 else size for size in stats["litter_size"]]
+    targets = [None if i < 0 else foods[i] for i in arrays["orgs_target_food"].tolist()]
+    organisms = [
+        Organism.restore(
+            world.scenario,
+            world.streams.mutation,
+            tuple(topleft),
+            target_food=target,
+            **{stat: values[i] for stat, values in stats.items()},
+        )
+        for i, (topleft, target) in enumerate(
+            zip(arrays["orgs_topleft"].tolist(), targets)
+        )
+    ]
+
+    for organism in organisms:
+        if organism.target_food is not None:
+            organism.target_food.chasers.add(organism)
+
+    world.organisms = organisms
+    world.recount()
+    world.foods = foods
+    # food eaten in the frame before the checkpoint is still in the list until the next frame removes it,
+    # but it left the grid when it was eaten
+    world.food_grid = FoodGrid(food for food in foods if not food.eaten)
+    return world
@@ -0,0 +1,178 @@
+import os
+import csv
+import json
+import time
+import matplotlib.pyplot as plt
+
+
+def gather_data(data: dict, frame: int, world) -> dict:
+    """The stats of an ObjectWorld, read from the running totals in world.stats instead of going over every
+    organism"""
+    stats = world.stats.averages(world.scenario["speed_stat_scale"])
+    stats["food_available"] = len(world.foods)
+    return add_stats(data, frame, stats)
+
+
+def gather_vector_data(data: dict, frame: int, world) -> dict:
+    """gather_data for a VectorWorld"""
+    stats = world.stats.averages(world.scenario["speed_stat_scale"])
+    stats["food_available"] = len(world.foods["pos"])
+    return add_stats(data, frame, stats)
+
+
+def add_stats(data: dict, frame: int, stats: dict) -> dict:
+    """Add the stats the data is keeping track of, see the scenario's stats setting, and return them"""
+    data["frames"].append(frame / 100)  # acts as the x-axis for the graph
+    stats["time_passed"] = time.time() - data["start_time"]
+    sample = {stat: stats[stat] for stat in data["vals"]}
+    for stat, vals in data["vals"].items():
+        vals.append(sample[stat])
+    # with a history only the newest samples are kept. they're cut back once there are twice as many so
+    # the lists aren't shifted every time
+    history = data.get("history")
+    if history is not None and len(data["frames"]) >= 2 * history:
+        del data["frames"][:-history]
+        for vals in data["vals"].values():
+            del vals[:-history]
+    return sample
+
+
+class CsvSink:
+    """Writes the stats to a csv file, one row each time they're gathered, as soon as they're gathered"""
+
+    def __init__(self, path) -> None:
+        # appended to so a resumed run carries on the same file
+        self.file = open(path, "a", newline="")
+        # made on the first write, when the stats being kept are known
+        self.writer = None
+
+    def write(self, frame, sample):
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.file, ["frame", *sample])
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+        self.writer.writerow({"frame": frame, **sample})
+        # flushed every time so a crash loses nothing that was gathered
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlSink:
+    """CsvSink as json lines, one object per line"""
+
+    def __init__(self, path) -> None:
+        self.file = open(path, "a")
+
+    def write(self, frame, sample):
+        self.file.write(json.dumps({"frame": frame, **sample}, default=float) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SinkGroup:
+    """Writes the stats to every one of a few sinks"""
+
+    def __init__(self, sinks) -> None:
+        self.sinks = list(sinks)
+
+    def write(self, frame, sample):
+        for sink in self.sinks:
+            sink.write(frame, sample)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class LivePlot:
+    """A matplotlib figure of the stats that follows the run, used as a sink. Each write only adds the new
+    sample and the lines are redrawn with set_data at most once every refresh seconds. Once a line has
+    more than twice max_points points every other one is dropped and only every other sample from then
+    on is added, so drawing costs the same however long the run has been going"""
+
+    def __init__(self, refresh=1.0, max_points=500) -> None:
+        self.refresh = refresh
+        self.max_points = max_points
+        plt.ion()
+        self.figure, self.axes = plt.subplots()
+        self.axes.set_xlabel("Frames (100's)")
+        # made on the first write, when the stats being kept are known
+        self.lines = None
+        self.frames = []
+        self.vals = {}
+        # only every stride-th sample is added, the newest is always drawn
+        self.stride = 1
+        self.samples = 0
+        self.newest = None
+        self.last_draw = 0.0
+
+    def write(self, frame, sample):
+        if self.lines is None:
+            self.lines = {
+                stat: self.axes.plot([], [], label=stat)[0] for stat in sample
+            }
+            self.vals = {stat: [] for stat in sample}
+            self.axes.legend(loc="upper left")
+        self.newest = (frame / 100, sample)
+        if self.samples % self.stride == 0:
+            self.frames.append(frame / 100)
+            for stat, vals in self.vals.items():
+                vals.append(sample[stat])
+            if len(self.frames) > 2 * self.max_points:
+                del self.frames[1::2]
+                for vals in self.vals.values():
+                    del vals[1::2]
+                self.stride *= 2
+        self.samples += 1
+        if time.perf_counter() - self.last_draw >= self.refresh:
+            self.draw()
+
+    def draw(self):
+        if self.lines is None:
+            return
+        frame, sample = self.newest
+        for stat, line in self.lines.items():
+            line.set_data(self.frames + [frame], self.vals[stat] + [sample[stat]])
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.figure.canvas.draw_idle()
+        self.figure.canvas.flush_events()
+        self.last_draw = time.perf_counter()
+
+    def close(self):
+        # the end of run graph from produce_graph is drawn on its own figure
+        plt.close(self.figure)
+        plt.ioff()
+
+
+# the sink for each kind of stats file, by extension
+SINKS = {".csv": CsvSink, ".jsonl": JsonlSink}
+
+
+def open_sink(path):
+    """The sink that streams the stats to path, picked by path's extension"""
+    extension = os.path.splitext(path)[1]
+    if extension not in SINKS:
+        raise ValueError(
+            f"can't stream stats to {path}, the file has to end in one of {', '.join(SINKS)}"
+        )
+    return SINKS[extension](path)
+
+
+def produce_graph(data):
+
+    for category, val in data["vals"].items():
+        plt.plot(data["frames"], val, label=category)
+    plt.xlabel("Frames (100's)")
+    plt.legend()
+    plt.show()
+
+
+def save_data(data, path):
+    # numpy numbers can't be written as json so they are turned into floats
+    with open(path, "w") as f:
+        json.dump(data, f, default=float)
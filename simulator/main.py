@@ -0,0 +1,765 @@
+import math
+import time
+import argparse
+import numpy as np
+import pygame as pg
+from .Food import Food, FoodGrid, FoodPool
+from .Organism import Organism, font
+from .VectorWorld import VectorWorld
+from .Renderer import Renderer
+from .PhaseTimer import PhaseTimer
+from .PopulationStats import PopulationStats
+from .extras import (
+    gather_data,
+    gather_vector_data,
+    produce_graph,
+    save_data,
+    open_sink,
+    SinkGroup,
+    LivePlot,
+)
+from .scenario import load_scenario, make_scenario, preset_names
+from .streams import RandomStreams
+from .checkpoint import save_checkpoint, load_checkpoint
+
+# litters of at least this many children are made with one batch of random numbers instead of one child at a time
+BATCH_LITTER = 5
+# organisms without a target are targeted in one FoodGrid.nearest_many query when there are at least this
+# many, and at least one for every BATCH_TARGET_FOOD food, otherwise each searches the grid on its own
+BATCH_TARGET_MIN = 8
+BATCH_TARGET_FOOD = 100
+
+
+def start_sim(scenario, streams):
+    """Create some starting organisms and food, drawing from the streams of a RandomStreams"""
+    mutation, placement = streams.mutation, streams.placement
+    # like VectorWorld, these are drawn once and shared by every starting organism
+    color_weights = tuple(
+        mutation.randint(*scenario["start_color_weights"]) for _ in range(3)
+    )
+    max_age = mutation.randint(*scenario["start_max_age"])
+    litter_size = None
+    if scenario["litter_size_max"] is not None:
+        litter_size = mutation.randint(*scenario["start_litter_size"])
+    organisms = [
+        Organism(
+            (placement.randint(100, 900), placement.randint(100, 650)),
+            tuple(color),
+            round(mutation.uniform(*scenario["start_speed"]), 3),
+            scenario,
+            color_weights=color_weights,
+            max_age=max_age,
+            litter_size=litter_size,
+            rng=mutation,
+        )
+        for color in scenario["start_colors"]
+    ]
+    foods = [
+        Food((streams.spawn.randint(20, 40), streams.spawn.randint(20, 40)), placement)
+        for _ in range(scenario["food_amount"])
+    ]
+    return organisms, foods, FoodGrid(foods)
+
+
+class ObjectWorld:
+    """The organisms and food as Organism and Food objects"""
+
+    def __init__(self, scenario=None, max_population=10000, seed=None) -> None:
+        # the settings of the simulation, see scenario.py
+        self.scenario = scenario = make_scenario(scenario or {})
+        # every random number of the simulation comes from here, so the same seed gives the same run
+        self.streams = RandomStreams(seed)
+        self.organisms, self.foods, self.food_grid = start_sim(scenario, self.streams)
+        # eaten food is reused for new food
+        self.food_pool = FoodPool()
+        self.max_population = max_population
+        self.recount()
+
+    def __len__(self):
+        return len(self.organisms)
+
+    def close(self):
+        # nothing to stop, here so a world of either engine can be closed the same way
+        pass
+
+    def recount(self):
+        """Count every organism into new running stats, for when organisms is replaced as a whole"""
+        self.stats = PopulationStats(self.scenario["speed_digits"])
+        for organism in self.organisms:
+            self.stats.add(organism)
+
+    def step(self, timer=None):
+        """Move every organism and food forward one frame, timing each phase with timer when given one"""
+        self.spawn_food()
+        if timer is not None:
+            timer.lap("spawn")
+        self.remove_eaten_food()
+        if timer is not None:
+            timer.lap("cleanup")
+        self.update_organisms()
+        if timer is not None:
+            timer.lap("organisms")
+
+    def spawn_food(self):
+        spawn = self.streams.spawn
+        if spawn.randint(1, self.scenario["food_chance"]) == 2:
+            amount = spawn.randint(*self.scenario["food_spawn"])
+            foods = self.food_pool.spawn(
+                amount, (10, 20), spawn, self.streams.placement
+            )
+            self.foods.extend(foods)
+            for food in foods:
+                self.food_grid.add(food)
+
+    def remove_eaten_food(self):
+        # keeps the rest in a new list instead of removing from this one
+        if any(food.eaten for food in self.foods):
+            uneaten = []
+            eaten = []
+            for food in self.foods:
+                if food.eaten:
+                    self.food_grid.remove(food)
+                    eaten.append(food)
+                else:
+                    uneaten.append(food)
+            self.foods = uneaten
+            self.food_pool.release(eaten)
+
+    def retarget(self):
+        """Target the closest food for every living organism that has no target. Nothing else moves before an
+        organism's turn in update_organisms and anything chasing a food eaten before then is retargeted
+        again, so this picks the same food each one would have picked on its turn"""
+        if self.scenario["perception"] == "density":
+            # organisms sense food on their turn in update_organisms instead
+            return
+        uses_energy = self.scenario["energy"] is not None
+        need = [
+            organism
+            for organism in self.organisms
+            if organism.target_food is None
+            and organism.age <= organism.max_age
+            and not (uses_energy and organism.energy <= 0)
+        ]
+        food_grid = self.food_grid
+        if len(food_grid) == 0:
+            return
+        if len(need) >= BATCH_TARGET_MIN and len(need) * BATCH_TARGET_FOOD >= len(
+            food_grid
+        ):
+            foods = food_grid.nearest_many([organism.pos.center for organism in need])
+            for organism, food in zip(need, foods):
+                organism.chase(food)
+        else:
+            for organism in need:
+                organism.target(food_grid)
+
+    def update_organisms(self):
+        """Target, move, reproduce and age every organism, leaving out the dead ones"""
+        self.retarget()
+        organisms, food_grid = self.organisms, self.food_grid
+        scenario = self.scenario
+        uses_energy = scenario["energy"] is not None
+        density = scenario["perception"] == "density"
+        mutation = self.streams.mutation
+        stats = self.stats
+        # organisms that live through this frame, in visiting order. dead ones are left out instead of
+        # removed from organisms so the loop never shifts the list
+        survivors = []
+        # the population as the loop goes, counting deaths and births so far
+        population = born_after = len(organisms)
+        for organism in reversed(organisms) if scenario["newest_first"] else organisms:
+
+            if organism.age > organism.max_age or (
+                uses_energy and organism.energy <= 0
+            ):
+                population -= 1
+                stats.remove(organism)
+                # so the food it was chasing doesn't hold on to it
+                if organism.target_food is not None:
+                    organism.target_food.chasers.discard(organism)
+                continue
+            # if the organsim has no target food, target the closest food. only children born this frame
+            # and organisms whose food was eaten since retarget get here
+            if organism.target_food is None:
+                if density:
+                    organism.sense(food_grid)
+                else:
+                    organism.target(food_grid)
+            organism.move(food_grid)
+            # check if organism has eaten enough to reproduce
+            if (
+                organism.food_eaten >= organism.reproduce_food
+                and population < self.max_population
+            ):
+                if organism.litter_size is None:
+                    children = [organism.reproduce()]
+                else:
+                    litter = mutation.randint(0, organism.litter_size)
+                    if litter >= BATCH_LITTER:
+                        children = organism.reproduce_litter(
+                            litter, self.streams.mutation_batch
+                        )
+                    else:
+                        # reproduce
+                        children = [organism.reproduce() for i in range(litter)]
+                organisms.extend(children)
+                population += len(children)
+                for child in children:
+                    stats.add(child)
+
+                organism.food_eaten = 0
+            if uses_energy:
+                # reduce organism's energy by 1
+                organism.energy -= 1
+            organism.age += 1
+            survivors.append(organism)
+
+        if scenario["newest_first"]:
+            survivors.reverse()
+            # going backwards, the children born this frame are never visited
+            survivors.extend(organisms[born_after:])
+        self.organisms = survivors
+
+    def render_arrays(self):
+        foods = [food for food in self.foods if not food.eaten]
+        return {
+            "food_pos": np.array([food.pos.center for food in foods]).reshape(-1, 2),
+            "food_size": np.array([food.pos.size for food in foods]).reshape(-1, 2),
+            "pos": np.array([org.pos.center for org in self.organisms]).reshape(-1, 2),
+            "color": np.array([org.COLOR for org in self.organisms]).reshape(-1, 3),
+            "gen": np.array([org.gen for org in self.organisms], dtype=np.int64),
+        }
+
+    def summon(self, screen):
+        for food in self.foods:
+            # food eaten this frame is only taken out of foods next frame
+            if not food.eaten:
+                food.summon(screen)
+        for organism in self.organisms:
+            organism.summon(screen)
+
+
+def new_world(scenario, vector=False, max_population=10000, seed=None, workers=1):
+    """The starting world of a scenario. The same seed always gives the same run, no seed picks one.
+    workers is only used by the vector engine"""
+    if vector:
+        return VectorWorld(scenario, max_population, seed=seed, workers=workers)
+    return ObjectWorld(scenario, max_population, seed)
+
+
+def new_data(scenario, seed, history=None):
+    # dict to keep track of all stats and data
+    return {
+        "start_time": time.time(),
+        # the seed of the world, to run it again
+        "seed": seed,
+        # how many of the newest samples to keep, None keeps them all
+        "history": history,
+        "gather_seconds": 0.0,
+        "frames": [],
+        "vals": {stat: [] for stat in scenario["stats"]},
+    }
+
+
+def gather(data, frames_passed, world, sink=None):
+    start = time.perf_counter()
+    if isinstance(world, VectorWorld):
+        sample = gather_vector_data(data, frames_passed, world)
+    else:
+        sample = gather_data(data, frames_passed, world)
+    if sink is not None:
+        sink.write(frames_passed, sample)
+    # keep track of how long collecting the stats takes
+    data["gather_seconds"] += time.perf_counter() - start
+
+
+def simulate(
+    world,
+    frames=None,
+    stats_interval=100,
+    data=None,
+    frames_passed=0,
+    checkpoint=None,
+    checkpoint_interval=None,
+    sink=None,
+    timer=None,
+):
+    """Step the world with no window or frame rate cap until `frames` frames have passed (or forever
+    when None) or everything has gone extinct. Returns the data and the number of frames that passed.
+
+    data and frames_passed carry on a run loaded with load_checkpoint. A checkpoint is saved to the
+    checkpoint path every checkpoint_interval frames when both are given, and every set of stats is
+    written to sink as it's gathered when there is one. timer times the phases of every step
+    """
+    if data is None:
+        data = new_data(world.scenario, world.streams.seed)
+    if timer is not None:
+        timer.restart()
+    while frames is None or frames_passed < frames:
+        frames_passed += 1
+        if frames_passed % stats_interval == 0:
+            gather(data, frames_passed, world, sink)
+        # organisms have all gone extinct
+        if len(world) == 0:
+            break
+        if timer is not None:
+            timer.lap("stats")
+        world.step(timer)
+        if timer is not None:
+            timer.end_frame(frames_passed, len(world))
+        if checkpoint_interval and frames_passed % checkpoint_interval == 0:
+            save_checkpoint(checkpoint, world, data, frames_passed)
+    return data, frames_passed
+
+
+def run_headless(
+    world,
+    frames=None,
+    output="data.json",
+    stats_interval=100,
+    data=None,
+    frames_passed=0,
+    checkpoint=None,
+    checkpoint_interval=None,
+    sink=None,
+    timer=None,
+):
+    """simulate() then save the data to output, and a checkpoint of the end of the run when one is given"""
+    data, frames_passed = simulate(
+        world,
+        frames,
+        stats_interval,
+        data,
+        frames_passed,
+        checkpoint,
+        checkpoint_interval,
+        sink,
+        timer,
+    )
+    save_data(data, output)
+    if checkpoint:
+        save_checkpoint(checkpoint, world, data, frames_passed)
+        print(f"checkpoint saved to {checkpoint}")
+    run_time = time.time() - data["start_time"]
+    print(
+        f"{frames_passed} frames, {len(world)} organisms left, seed {data['seed']}, data saved to {output}"
+    )
+    print(
+        f"collecting stats took {data['gather_seconds']:.3f}s of {run_time:.3f}s"
+        f" ({data['gather_seconds'] / run_time:.2%})"
+    )
+    if timer is not None and timer.enabled:
+        print(timer.summary())
+
+
+class StepScheduler:
+    """Decides how many simulation steps to run before each redraw. With a step rate it runs as many
+    steps as the time since the last redraw calls for, up to max_steps so a slow redraw can't snowball,
+    otherwise it runs steps_per_frame steps every redraw"""
+
+    def __init__(self, steps_per_frame=1, step_rate=None, max_steps=50) -> None:
+        self.steps_per_frame = steps_per_frame
+        self.step_rate = step_rate
+        self.max_steps = max_steps
+        # steps that are due but haven't been run yet
+        self.owed = 0.0
+
+    def steps(self, seconds):
+        if self.step_rate is None:
+            return self.steps_per_frame
+        self.owed += seconds * self.step_rate
+        steps = min(int(self.owed), self.max_steps)
+        # anything over the budget is dropped instead of being caught up on later
+        self.owed = min(self.owed - steps, 1)
+        return steps
+
+    def speed_up(self):
+        if self.step_rate is None:
+            self.steps_per_frame *= 2
+        else:
+            self.step_rate *= 2
+
+    def slow_down(self):
+        if self.step_rate is None:
+            self.steps_per_frame = max(self.steps_per_frame // 2, 1)
+        elif self.step_rate > 1:
+            # halved down to 1 step a second, a rate slower than that from --step-rate is left as it is
+            self.step_rate = max(self.step_rate / 2, 1)
+
+    def describe(self):
+        if self.step_rate is None:
+            return f"{self.steps_per_frame}x"
+        return f"{round(self.step_rate, 2):g} steps/s"
+
+
+def run_window(
+    scenario,
+    vector=False,
+    max_population=10000,
+    scheduler=None,
+    renderer=None,
+    stats_interval=100,
+    seed=None,
+    checkpoint="checkpoint.npz",
+    resumed=None,
+    sink=None,
+    history=None,
+    timer=None,
+    workers=1,
+):
+    BLACK = (0, 0, 0)
+
+    screen_size = (900, 700)
+
+    # create a window
+    screen = pg.display.set_mode(screen_size)
+    pg.display.set_caption("pg Test")
+
+    # clock is used to set a max fps
+    clock = pg.time.Clock()
+
+    running = True
+    paused = False
+    frame_rate = 60
+    if resumed is None:
+        world = new_world(scenario, vector, max_population, seed, workers)
+        data = new_data(scenario, world.streams.seed, history)
+        frames_passed = 0
+    else:
+        # the world, data and frames_passed of a checkpoint from load_checkpoint
+        world, data, frames_passed = resumed
+        scenario = world.scenario
+        vector = isinstance(world, VectorWorld)
+        if vector:
+            world.workers = workers
+        if history is not None:
+            data["history"] = history
+
+    if scheduler is None:
+        scheduler = StepScheduler()
+    if renderer is None:
+        renderer = Renderer()
+    if timer is None:
+        timer = PhaseTimer()
+    timer.restart()
+
+    while running:
+        for event in pg.event.get():
+            # key handling
+            if event.type == pg.QUIT:
+                running = False
+
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_ESCAPE:
+                    running = False
+                # restart the simulation
+                if event.key == pg.K_r:
+                    world.close()
+                    world = new_world(scenario, vector, max_population, seed, workers)
+                # pause the simulation
+                if event.key == pg.K_p:
+                    paused = not paused
+                # show or hide how long each phase of a frame takes
+                if event.key == pg.K_t:
+                    timer.toggle()
+                # save everything to carry on from later with --resume
+                if event.key == pg.K_c:
+                    save_checkpoint(checkpoint, world, data, frames_passed)
+                    print(f"checkpoint of frame {frames_passed} saved to {checkpoint}")
+                # arrows control framerate
+                if event.key == pg.K_RIGHT:
+                    frame_rate += 15
+                if event.key == pg.K_LEFT:
+                    if frame_rate > 15:
+                        frame_rate -= 15
+                # up and down change how many simulation steps run between redraws
+                if event.key == pg.K_UP:
+                    scheduler.speed_up()
+                if event.key == pg.K_DOWN:
+                    scheduler.slow_down()
+
+        timer.lap("events")
+
+        if not paused:
+            for _ in range(scheduler.steps(clock.get_time() / 1000)):
+                frames_passed += 1
+                if frames_passed % stats_interval == 0:
+                    gather(data, frames_passed, world, sink)
+                timer.lap("stats")
+                # organisms have all gone extinct
+                if len(world) == 0:
+                    running = False
+                    break
+                world.step(timer)
+
+            screen.fill(BLACK)
+            renderer.summon(screen, world)
+            # renders for population and framerate
+            organism_render = font.render(
+                f"# Organisms: {len(world)}", True, (255, 255, 255)
+            )
+            frame_rate_render = font.render(
+                f"FPS: {round(clock.get_fps())}/{frame_rate}", True, (255, 255, 255)
+            )
+            speed_render = font.render(
+                f"Speed: {scheduler.describe()}", True, (255, 255, 255)
+            )
+            screen.blit(organism_render, (10, 10))
+            screen.blit(frame_rate_render, (10, 30))
+            screen.blit(speed_render, (10, 50))
+            if timer.enabled:
+                for i, line in enumerate(timer.overlay()):
+                    screen.blit(
+                        font.render(line, True, (255, 255, 255)), (10, 80 + i * 20)
+                    )
+            timer.lap("draw")
+
+        pg.display.flip()
+        timer.lap("flip")
+        clock.tick(frame_rate)
+        timer.lap("idle")
+        timer.end_frame(frames_passed, len(world))
+
+    world.close()
+    return data
+
+
+def positive_int(value):
+    """argparse type for a whole number of at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value} is not a whole number")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"has to be at least 1, not {number}")
+    return number
+
+
+def positive_float(value):
+    """argparse type for a finite number above 0"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{value} is not a number")
+    if not (number > 0 and math.isfinite(number)):
+        raise argparse.ArgumentTypeError(f"has to be more than 0, not {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m simulator")
+    parser.add_argument(
+        "scenario",
+        nargs="?",
+        default="simple",
+        help=f"a .json or .toml scenario file or one of the presets: {', '.join(preset_names())}",
+    )
+    parser.add_argument(
+        "--vector",
+        action="store_true",
+        help="store the organisms and food as numpy arrays, for very large populations",
+    )
+    parser.add_argument(
+        "--max-population",
+        type=int,
+        default=10000,
+        help="organisms stop reproducing once the population reaches this size",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run as fast as possible with no window and save the data instead of graphing it",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=None,
+        help="number of frames to run with --headless, runs until extinction when not given",
+    )
+    parser.add_argument(
+        "--output",
+        default="data.json",
+        help="file the data is saved to with --headless",
+    )
+    parser.add_argument(
+        "--steps-per-frame",
+        type=positive_int,
+        default=1,
+        help="simulation steps run between redraws of the window",
+    )
+    parser.add_argument(
+        "--step-rate",
+        type=positive_float,
+        default=None,
+        help="simulation steps per second, overrides --steps-per-frame and catches up when redraws are slow",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=positive_int,
+        default=50,
+        help="most steps --step-rate will run between two redraws",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=["bulk", "entity"],
+        default="bulk",
+        help="bulk draws every organism in one pass over the screen, entity draws them one at a time",
+    )
+    parser.add_argument(
+        "--label-limit",
+        type=int,
+        default=500,
+        help="generation numbers are only drawn on organisms while the population is at most this, 0 turns them off",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=positive_int,
+        default=100,
+        help="number of frames between each time the stats are collected",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="file a checkpoint is saved to at the end of a --headless run, and when c is pressed in the window"
+        " (checkpoint.npz when not given)",
+    )
+    parser.add_argument(
+        "--checkpoint-interval",
+        type=positive_int,
+        default=None,
+        help="with --headless and --checkpoint, also save the checkpoint every this many frames",
+    )
+    parser.add_argument(
+        "--resume",
+        default=None,
+        help="carry on from a checkpoint, which has its own scenario, engine and seed",
+    )
+    parser.add_argument(
+        "--stats-file",
+        default=None,
+        help="also write every set of stats to this .csv or .jsonl file as soon as it's gathered",
+    )
+    parser.add_argument(
+        "--stats-history",
+        type=positive_int,
+        default=None,
+        help="keep only about this many of the newest sets of stats in memory (for the graph and --output),"
+        " all of them are kept when not given",
+    )
+    parser.add_argument(
+        "--live-plot",
+        action="store_true",
+        help="show a graph of the stats that updates while the simulation runs",
+    )
+    parser.add_argument(
+        "--plot-refresh",
+        type=float,
+        default=1.0,
+        help="seconds between redraws of --live-plot",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="time each phase of every frame from the start, shown in the window (t turns it on and off)"
+        " and printed at the end of a --headless run",
+    )
+    parser.add_argument(
+        "--trace",
+        default=None,
+        help="write how long each phase of every frame took to this csv file while timing is on, turns"
+        " timing on like --profile",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="threads the vector engine splits targeting over, one band of the world each",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="runs with the same seed and settings are exactly the same, a random one is used when not given",
+    )
+    args = parser.parse_args(argv)
+    try:
+        scenario = load_scenario(args.scenario)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.vector and scenario["perception"] != "nearest":
+        parser.error("--vector only works with nearest perception")
+    if args.checkpoint_interval is not None and args.checkpoint is None:
+        parser.error("--checkpoint-interval needs a --checkpoint to save to")
+    resumed = None
+    if args.resume is not None:
+        try:
+            resumed = load_checkpoint(args.resume)
+        except (OSError, ValueError) as e:
+            parser.error(f"can't resume from {args.resume}: {e}")
+
+    sinks = []
+    if args.stats_file is not None:
+        try:
+            sinks.append(open_sink(args.stats_file))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.live_plot:
+        sinks.append(LivePlot(args.plot_refresh))
+    sink = SinkGroup(sinks) if sinks else None
+    timer = PhaseTimer(args.profile or args.trace is not None, args.trace)
+
+    # initialize pg
+    pg.init()
+
+    if args.headless:
+        if resumed is None:
+            world = new_world(
+                scenario, args.vector, args.max_population, args.seed, args.workers
+            )
+            data = new_data(scenario, world.streams.seed, args.stats_history)
+            frames_passed = 0
+        else:
+            world, data, frames_passed = resumed
+            if isinstance(world, VectorWorld):
+                world.workers = args.workers
+            if args.stats_history is not None:
+                data["history"] = args.stats_history
+        run_headless(
+            world,
+            args.frames,
+            args.output,
+            args.stats_interval,
+            data,
+            frames_passed,
+            args.checkpoint,
+            args.checkpoint_interval,
+            sink,
+            timer,
+        )
+        world.close()
+    else:
+        scheduler = StepScheduler(args.steps_per_frame, args.step_rate, args.max_steps)
+        renderer = Renderer(label_limit=args.label_limit, bulk=args.renderer == "bulk")
+        data = run_window(
+            scenario,
+            args.vector,
+            args.max_population,
+            scheduler,
+            renderer,
+            args.stats_interval,
+            args.seed,
+            args.checkpoint or "checkpoint.npz",
+            resumed,
+            sink,
+            args.stats_history,
+            timer,
+            args.workers,
+        )
+    if sink is not None:
+        sink.close()
+    timer.close()
+    if not args.headless:
+        # after the sinks are closed so a live plot is out of the way
+        produce_graph(data)
+
+    pg.quit()
@@ -0,0 +1,106 @@
+import os
+import json
+
+try:
+    import tomllib
+except ImportError:  # python < 3.11
+    tomllib = None
+
+# the ways organisms can find food, see the perception setting
+PERCEPTIONS = ("nearest", "density")
+
+PRESETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "variations")
+
+# every setting a scenario can change, set to the values of the simple preset
+DEFAULTS = {
+    # the starting organisms, one for each color
+    "start_colors": [[255, 0, 0], [0, 255, 0], [0, 0, 255]],
+    "start_speed": [1, 6],
+    # the starting color weights, max age and litter size are drawn once and shared by every starting organism
+    "start_color_weights": [0, 255],
+    "start_max_age": [100, 400],
+    "start_litter_size": [2, 4],
+    "food_amount": 100,
+    # a max age of max_age_cap or more is redrawn from max_age_reset
+    "max_age_cap": 1200,
+    "max_age_reset": [200, 300],
+    "color_weight_max": 16,
+    # null means every reproduction has exactly one child
+    "litter_size_max": 11,
+    # how far below and above the parent's speed and max age a child's can be
+    "speed_mutation": [7, 7],
+    "speed_digits": 3,
+    "max_age_mutation": [100, 100],
+    # the range starting energy is drawn from, null means organisms don't use energy
+    "energy": None,
+    "energy_gain": 0,
+    # food is spawned when a 1 in food_chance roll comes up
+    "food_chance": 6,
+    "food_spawn": [1, 4],
+    # the Organism loop goes through the newest organisms first, which decides who gets a food several organisms
+    # reach at once and who reproduces when the population cap is near. the vector engine follows it too, except
+    # that without it children born in a frame only start moving the next frame instead of straight away
+    "newest_first": True,
+    # how organisms find food. nearest targets the closest food, density only targets food in the organism's
+    # own grid cell and otherwise heads for wherever nearby has the most food, which costs the same however
+    # much food there is. density only works with the object engine
+    "perception": "nearest",
+    # the stats collected for the graph, in the order they are drawn
+    "stats": [
+        "population",
+        "avg_gen",
+        "avg_mut",
+        "food_available",
+        "highest_gen",
+        "avg_speed",
+        "avg_max_age",
+        "avg_litter_size",
+    ],
+    # avg_speed is multiplied by this to make it easier to read on the graph
+    "speed_stat_scale": 10,
+}
+
+
+def preset_names():
+    return sorted(
+        name
+        for name in os.listdir(PRESETS)
+        if os.path.isfile(os.path.join(PRESETS, name, "scenario.json"))
+    )
+
+
+def load_scenario(name="simple"):
+    """Load a scenario from a .json or .toml file, a folder with a scenario.json in it, or the name of a
+    folder under variations. Settings the file leaves out keep their DEFAULTS value"""
+    path = name
+    if not os.path.exists(path):
+        path = os.path.join(PRESETS, name)
+    if os.path.isdir(path):
+        path = os.path.join(path, "scenario.json")
+    if not os.path.isfile(path):
+        raise ValueError(
+            f"{name} is not a scenario file or one of the presets: {', '.join(preset_names())}"
+        )
+
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"{path}: toml scenarios need python 3.11 or newer")
+        with open(path, "rb") as f:
+            settings = tomllib.load(f)
+    else:
+        with open(path) as f:
+            settings = json.load(f)
+    return make_scenario(settings)
+
+
+def make_scenario(settings):
+    """DEFAULTS with settings on top, checking every setting is one DEFAULTS knows about"""
+    unknown = set(settings) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown scenario settings: {', '.join(sorted(unknown))}")
+    scenario = {**DEFAULTS, **settings}
+    if scenario["perception"] not in PERCEPTIONS:
+        raise ValueError(
+            f"perception has to be one of {', '.join(PERCEPTIONS)}, not {scenario['perception']}"
+        )
+    return scenario
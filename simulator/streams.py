@@ -0,0 +1,47 @@
+import random
+import numpy as np
+
+# the names of the streams, each also has a numpy version with _batch on the end
+STREAMS = ("spawn", "placement", "mutation")
+
+
+class RandomStreams:
+    """A separate stream of random numbers for each part of the simulation, all made from one seed, so two runs
+    with the same seed draw exactly the same numbers. Each part drawing from its own stream means a change to
+    how one part uses random numbers leaves the others' numbers alone.
+
+    spawn is for when food appears and how big it is, placement for where food and the starting organisms
+    are put and mutation for everything an organism is born with. Each is a random.Random, which is quicker
+    for one number at a time, and the *_batch versions are numpy Generators for many numbers at once
+    """
+
+    def __init__(self, seed=None) -> None:
+        seed_sequence = np.random.SeedSequence(seed)
+        # with no seed this is the one that was picked, so the run can still be repeated
+        self.seed = seed_sequence.entropy
+        spawn, placement, mutation = seed_sequence.spawn(len(STREAMS))
+        self.spawn, self.spawn_batch = self.make_pair(spawn)
+        self.placement, self.placement_batch = self.make_pair(placement)
+        self.mutation, self.mutation_batch = self.make_pair(mutation)
+
+    def get_state(self):
+        """Where every stream is up to, as json friendly values, for set_state to carry on from later"""
+        state = {}
+        for name in STREAMS:
+            version, internal, gauss_next = getattr(self, name).getstate()
+            state[name] = [version, list(internal), gauss_next]
+            state[name + "_batch"] = getattr(self, name + "_batch").bit_generator.state
+        return state
+
+    def set_state(self, state):
+        for name in STREAMS:
+            version, internal, gauss_next = state[name]
+            getattr(self, name).setstate((version, tuple(internal), gauss_next))
+            getattr(self, name + "_batch").bit_generator.state = state[name + "_batch"]
+
+    @staticmethod
+    def make_pair(seed_sequence):
+        single, batch = seed_sequence.spawn(2)
+        state = single.generate_state(4, np.uint64).tobytes()
+        single = random.Random(int.from_bytes(state, "little"))
+        return single, np.random.default_rng(batch)
@@ -0,0 +1,127 @@
+"""Run many headless simulations over a grid of settings at once, one process per core.
+
+Every combination of the --param values is run --seeds times (seeds 0, 1, 2, ...) for every --scenario,
+using the vector engine with that scenario's settings and the combination on top. Each run's data is
+collected into one json file.
+
+    python sweep.py --scenario var5 --scenario rainbowwww --param energy_gain=[10,15,40] --seeds 4
+"""
+
+import os
+import json
+import time
+import argparse
+import itertools
+import multiprocessing as mp
+
+# importing the simulator starts pygame, which needs to know there is no window before then
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from simulator.main import simulate, positive_int
+from simulator.scenario import load_scenario, make_scenario
+from simulator.VectorWorld import VectorWorld
+
+
+def run(job):
+    name, scenario, settings, seed, frames, max_population, stats_interval = job
+    world = VectorWorld(scenario, max_population, seed=seed)
+    start = time.perf_counter()
+    data, frames_passed = simulate(world, frames, stats_interval)
+    return {
+        "scenario": name,
+        "settings": settings,
+        "seed": seed,
+        "frames_passed": frames_passed,
+        "population": len(world),
+        "seconds": time.perf_counter() - start,
+        "frames": data["frames"],
+        "vals": data["vals"],
+    }
+
+
+def parse_param(text):
+    name, _, values = text.partition("=")
+    values = json.loads(values)
+    if not isinstance(values, list):
+        raise argparse.ArgumentTypeError(f"{text}: the values must be a json list")
+    return name, values
+
+
+def settings_grid(params):
+    names = [name for name, _ in params]
+    for values in itertools.product(*(values for _, values in params)):
+        yield dict(zip(names, values))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        help="a scenario file or preset to take the settings from, can be given more than once",
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        type=parse_param,
+        default=[],
+        help="a scenario setting and the json list of values to try, like energy_gain=[10,40]",
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=3, help="runs of every combination"
+    )
+    parser.add_argument(
+        "--frames", type=int, default=5000, help="most frames in each run"
+    )
+    parser.add_argument("--max-population", type=int, default=10000)
+    parser.add_argument("--stats-interval", type=positive_int, default=100)
+    parser.add_argument(
+        "--processes", type=int, default=None, help="defaults to one per core"
+    )
+    parser.add_argument("--output", default="sweep.json")
+    args = parser.parse_args()
+
+    try:
+        jobs = [
+            (
+                name,
+                # checked here so a misspelt setting stops the sweep before any run starts
+                make_scenario({**load_scenario(name), **settings}),
+                settings,
+                seed,
+                args.frames,
+                args.max_population,
+                args.stats_interval,
+            )
+            for name in args.scenario or ["simple"]
+            for settings in settings_grid(args.param)
+            for seed in range(args.seeds)
+        ]
+    except ValueError as e:
+        parser.error(str(e))
+    if any(job[1]["perception"] != "nearest" for job in jobs):
+        parser.error("sweeps use the vector engine, which only has nearest perception")
+    runs = []
+    start = time.perf_counter()
+    pool = mp.Pool(args.processes)
+    for result in pool.imap_unordered(run, jobs):
+        runs.append(result)
+        print(
+            f"{result['scenario']} {result['settings']} seed {result['seed']}:"
+            f" {result['frames_passed']} frames, {result['population']} organisms left"
+            f" ({result['seconds']:.1f}s)"
+        )
+    # workers are let finish instead of terminated, pygame can leave them ignoring SIGTERM
+    pool.close()
+    pool.join()
+
+    with open(args.output, "w") as f:
+        json.dump({"runs": runs}, f, default=float)
+    print(
+        f"{len(runs)} runs in {time.perf_counter() - start:.1f}s, saved to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()